@@ -0,0 +1,209 @@
+"""
+FastAPI application serving the code review agent.
+
+Run it with `python main.py`, which starts uvicorn on this module's app.
+"""
+import os
+import atexit
+import logging
+import queue
+import warnings
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.middleware.cors import CORSMiddleware
+from src.code_review_agent.agent import graph, build_graph, open_checkpointer
+from src.code_review_agent.http_client import SHARED_HTTPX
+from src.code_review_agent.agents.supervisor import warmup_agents
+from src.code_review_agent.error_handler import error_handler, ErrorCategory, Severity
+from copilotkit import LangGraphAGUIAgent
+from ag_ui_langgraph import add_langgraph_fastapi_endpoint
+
+_ = load_dotenv(override=True)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+# Hand log records to a background thread so handlers never block the event loop on I/O
+_log_queue = queue.SimpleQueue()
+_root_logger = logging.getLogger()
+_log_listener = QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage application startup and shutdown."""
+    # Build the agents at startup so the first request doesn't pay for it;
+    # WARMUP_PING=1 also pre-opens connections to the LLM provider
+    for error in await warmup_agents(ping=os.getenv("WARMUP_PING") == "1"):
+        error_handler.log_error(
+            category=ErrorCategory.AGENT_ERROR,
+            severity=Severity.WARNING,
+            message="Failed to warm up agent at startup",
+            node="lifespan",
+            exception=error
+        )
+    # Serve /explain from a graph compiled with the persistent checkpointer
+    async with open_checkpointer() as checkpointer:
+        explain_agent.graph = build_graph(checkpointer)
+        yield
+    explain_agent.graph = graph
+    # Close the shared LLM connection pool
+    await SHARED_HTTPX.aclose()
+
+
+app = FastAPI(title="Code Review Agent API", version="1.0.0", lifespan=lifespan)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+# Paths that bypass request tracking
+UNTRACKED_PATHS = frozenset({"/health"})
+
+
+class RequestIdMiddleware:
+    """
+    Add request ID to all requests for tracking.
+
+    Implemented as a pure ASGI middleware so no Request/Response objects or
+    task groups are allocated per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Health probes are polled frequently; don't track them as requests
+        if scope["type"] != "http" or scope["path"] in UNTRACKED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+
+        # Expose the ID to endpoints via request.state.request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        # Start tracking request
+        error_handler.start_request(request_id)
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+                # Mark request as completed
+                error_handler.complete_request(request_id, success=message["status"] < 400)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as e:
+            # Log error and mark request as failed
+            error_handler.log_error(
+                category=ErrorCategory.UNKNOWN_ERROR,
+                severity=Severity.ERROR,
+                message=f"Unhandled exception in request: {str(e)}",
+                node="api_middleware",
+                exception=e,
+                request_id=request_id
+            )
+            error_handler.complete_request(request_id, success=False)
+            raise
+
+
+app.add_middleware(RequestIdMiddleware)
+
+
+@app.exception_handler(Exception)
+async def global_exception_handler(request: Request, exc: Exception):
+    """Global exception handler for all unhandled exceptions."""
+    request_id = getattr(request.state, "request_id", "unknown")
+    
+    error_handler.log_error(
+        category=ErrorCategory.UNKNOWN_ERROR,
+        severity=Severity.ERROR,
+        message=f"Unhandled exception: {str(exc)}",
+        node="api_endpoint",
+        exception=exc,
+        request_id=request_id,
+        context={
+            "path": request.url.path,
+            "method": request.method,
+        }
+    )
+    
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal server error",
+            "message": "An unexpected error occurred",
+            "request_id": request_id,
+        }
+    )
+
+
+@app.get("/health")
+async def health_check(full: bool = False):
+    """
+    Health check endpoint.
+    
+    Returns a plain "ok" for liveness probes; pass ?full=1 for error metrics.
+    """
+    if not full:
+        return PlainTextResponse("ok")
+    
+    metrics = error_handler.get_metrics()
+    
+    # Determine health status
+    critical_errors = metrics.get("error_counts", {}).get("unknown_error_critical", 0)
+    is_healthy = critical_errors == 0
+    
+    return {
+        "status": "healthy" if is_healthy else "degraded",
+        "metrics": metrics,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# Original endpoint (commented out - using /explain instead)
+# add_langgraph_fastapi_endpoint(
+#     app=app,
+#     agent=LangGraphAGUIAgent(
+#         name="code_review_agent",
+#         description="An AI code review agent that analyzes, explains, and suggests improvements for your code using AST parsing and LLM analysis.",
+#         graph=graph,
+#     ),
+#     path="/",
+# )
+
+# New /explain endpoint; the lifespan swaps in the checkpointed graph
+explain_agent = LangGraphAGUIAgent(
+    name="code_review_agent",
+    description="An AI code review agent that analyzes, explains, and suggests improvements for your code using AST parsing and LLM analysis.",
+    graph=graph,
+)
+add_langgraph_fastapi_endpoint(
+    app=app,
+    agent=explain_agent,
+    path="/explain",
+)
+
+
+warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
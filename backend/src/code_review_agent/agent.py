@@ -1,14 +1,19 @@
 """
 Code Review Agent using LangGraph with Multi-Agent Architecture.
 
-This agent uses a sequential graph flow:
+This agent uses a fan-out/fan-in graph flow:
 - Entry Node: Extracts code from CopilotKit
-- Validation Node: Runs validation agent
-- Analyzer Node: Runs analyzer agent
+- Validation Node: Runs validation agent (in parallel with Analyzer Node)
+- Analyzer Node: Runs analyzer agent (in parallel with Validation Node)
 - Summarizer Node: Combines results and sends to frontend
+
+Repeat submissions of identical code are answered from a cache and go
+straight from the Entry Node to the Summarizer Node.
 """
 
-from langgraph.checkpoint.memory import MemorySaver
+import os
+from contextlib import asynccontextmanager
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import StateGraph
 from src.code_review_agent.state import CodeReviewState
 from src.code_review_agent.agents.nodes import (
@@ -26,13 +31,55 @@ workflow.add_node("validation_node", validation_node)
 workflow.add_node("analyzer_node", analyzer_node)
 workflow.add_node("summarizer_node", summarizer_node)
 
-# Sequential flow: entry -> validation -> analyzer -> summarizer -> end
-workflow.add_edge("entry_node", "validation_node")
-workflow.add_edge("validation_node", "analyzer_node")
+
+
+def route_after_entry(state: CodeReviewState) -> list[str]:
+    """Skip validation and analysis when a cached summary exists for the code."""
+    if state.get("cached_summary"):
+        return ["summarizer_node"]
+    return ["validation_node", "analyzer_node"]
+
+
+# Parallel flow: entry -> (validation | analyzer) -> summarizer -> end
+# Validation and analysis only depend on the user code, so they run concurrently
+workflow.add_conditional_edges(
+    "entry_node",
+    route_after_entry,
+    ["validation_node", "analyzer_node", "summarizer_node"],
+)
+workflow.add_edge("validation_node", "summarizer_node")
 workflow.add_edge("analyzer_node", "summarizer_node")
 workflow.add_edge("summarizer_node", "__end__")
 workflow.set_entry_point("entry_node")
 
-# Compile with memory checkpointer
-checkpointer = MemorySaver()
-graph = workflow.compile(checkpointer=checkpointer)
+# Checkpoints are persisted to SQLite so state survives worker restarts and
+# memory doesn't grow unbounded
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "./.lg_ckpt.sqlite")
+# How long a writer waits for another worker's lock before giving up
+CHECKPOINT_BUSY_TIMEOUT_MS = int(os.getenv("CHECKPOINT_BUSY_TIMEOUT_MS", "5000"))
+
+
+def build_graph(checkpointer=None):
+    """Compile the workflow, persisting state with the given checkpointer."""
+    return workflow.compile(checkpointer=checkpointer)
+
+
+@asynccontextmanager
+async def open_checkpointer(conn_string: str = CHECKPOINT_DB):
+    """
+    Open the SQLite checkpointer; the connection is closed when the context exits.
+
+    AsyncSqliteSaver must be created inside a running event loop, so this is
+    entered from the FastAPI lifespan. Every uvicorn worker opens its own
+    connection to the same file, so the database runs in WAL mode (readers
+    don't block the writer) and writers wait on a locked database instead of
+    failing straight away.
+    """
+    async with AsyncSqliteSaver.from_conn_string(conn_string) as checkpointer:
+        await checkpointer.conn.execute("PRAGMA journal_mode=WAL")
+        await checkpointer.conn.execute(f"PRAGMA busy_timeout={CHECKPOINT_BUSY_TIMEOUT_MS}")
+        yield checkpointer
+
+
+# Graph without persistence; the server builds its own with open_checkpointer()
+graph = build_graph()
@@ -1,32 +1,38 @@
 """
 Analyzer Agent - Explains code structure and behavior using AST tools.
 """
-import os
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
 from langgraph.prebuilt import create_react_agent
+from src.code_review_agent.llm import get_llm, resolve_llm_config
 from src.code_review_agent.tools.ast_tools import parse_python_code, extract_functions, get_code_complexity
 from src.code_review_agent.prompts.prompts import ANALYZER_AGENT_PROMPT
 
+ANALYZER_TOOLS = [parse_python_code, extract_functions, get_code_complexity]
 
-def create_analyzer_agent(llm: ChatOpenAI = None):
-    """Create and return the analyzer agent."""
-    if llm is None:
-        # Use Groq if GROQ_API_KEY is set, otherwise fall back to OpenAI
-        if os.getenv("GROQ_API_KEY"):
-            llm = ChatOpenAI(
-                model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
-                api_key=os.getenv("GROQ_API_KEY"),
-                base_url="https://api.groq.com/openai/v1",
-            )
-        else:
-            llm = ChatOpenAI(
-                model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-            )
+
+@lru_cache(maxsize=4)
+def _build_analyzer_agent(model: str, base_url: str | None, api_key: str | None):
+    """Build the analyzer agent once per (model, base_url, api_key)."""
+    llm = get_llm(model, base_url, api_key)
     
-    tools = [parse_python_code, extract_functions, get_code_complexity]
     agent = create_react_agent(
         model=llm,
-        tools=tools,
+        tools=ANALYZER_TOOLS,
         prompt=ANALYZER_AGENT_PROMPT
     )
     return agent
+
+
+def create_analyzer_agent(
+    model: str | None = None,
+    base_url: str | None = None,
+    api_key: str | None = None,
+):
+    """
+    Create and return the analyzer agent.
+    
+    Agents are cached per process, so the LLM client and react graph are
+    only built once for a given configuration.
+    """
+    model, base_url, api_key = resolve_llm_config(model, base_url, api_key)
+    return _build_analyzer_agent(model, base_url, api_key)
@@ -0,0 +1,150 @@
+"""
+Batch Queue - Micro-batches concurrent agent requests into a single LLM call.
+
+Requests arriving within a short window are packed into one numbered prompt,
+sent to the wrapped agent once, and the numbered response is split back out
+to each caller. A request whose answer is missing from the combined response
+is re-run on its own, so no caller ever sees another caller's section.
+Enabled with BATCH_LLM=1.
+"""
+import asyncio
+import logging
+import re
+from langchain_core.messages import AIMessage, HumanMessage
+
+logger = logging.getLogger(__name__)
+
+_SECTION_RE = re.compile(r"^#{1,6}\s*REQUEST\s+(\d+)\s*:?\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def _message_content(message) -> str:
+    """Return the text content of a message object or role/content dict."""
+    if isinstance(message, dict):
+        return message.get("content", "")
+    return getattr(message, "content", str(message))
+
+
+def _split_sections(content: str, count: int) -> dict:
+    """Split a batched response into {request_number: text}."""
+    parts = _SECTION_RE.split(content)
+    sections = {}
+    # parts = [preamble, num1, text1, num2, text2, ...]
+    for i in range(1, len(parts) - 1, 2):
+        number = int(parts[i])
+        if 1 <= number <= count:
+            sections[number] = parts[i + 1].strip()
+    return sections
+
+
+class BatchQueue:
+    """
+    Agent wrapper that batches concurrent ainvoke calls.
+
+    Exposes the same ainvoke() interface as the wrapped agent, so nodes can
+    use it as a drop-in replacement. Batches are flushed in the background,
+    so new requests keep being collected while earlier LLM calls run.
+    """
+
+    def __init__(self, agent, max_batch: int = 8, max_wait_ms: float = 30.0):
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._worker = None
+        self._flushes = set()
+
+    async def ainvoke(self, input: dict, config=None) -> dict:
+        """
+        Queue a request and wait for its share of the batched response.
+
+        config (callbacks, tags, metadata) is forwarded when the request is
+        sent on its own. A combined call serves several callers, so it runs
+        without any of their configs.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        content = "\n\n".join(_message_content(m) for m in input.get("messages", []))
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((content, config, future))
+        return {"messages": [AIMessage(content=await future)]}
+
+    async def _run(self):
+        """Collect requests until the batch is full or the wait window expires."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Don't hold up collecting the next batch while this one's LLM call runs
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _invoke(self, prompt: str, config=None) -> str:
+        """Send one prompt to the wrapped agent and return the reply text."""
+        result = await self.agent.ainvoke({"messages": [HumanMessage(content=prompt)]}, config)
+        return _message_content(result["messages"][-1])
+
+    async def _invoke_alone(self, content: str, config, future):
+        """Answer one request with its own LLM call."""
+        try:
+            response = await self._invoke(content, config)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(response)
+
+    async def _flush(self, batch: list):
+        """Send one LLM call for the whole batch and fulfill each future."""
+        # Skip requests whose callers already gave up (e.g. timed out)
+        batch = [request for request in batch if not request[2].done()]
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            await self._invoke_alone(*batch[0])
+            return
+
+        sections = "\n\n".join(
+            f"## REQUEST {i}\n{content}" for i, (content, _, _) in enumerate(batch, 1)
+        )
+        prompt = (
+            "Handle each of the following requests independently. Begin the "
+            "answer to each one with a heading line of the form `## REQUEST <n>`.\n\n"
+            f"{sections}"
+        )
+
+        try:
+            response = await self._invoke(prompt)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug("Batched %d requests into one LLM call", len(batch))
+        answers = _split_sections(response, len(batch))
+        retries = []
+        for i, (content, config, future) in enumerate(batch, 1):
+            if future.done():
+                continue
+            if i in answers:
+                future.set_result(answers[i])
+            else:
+                # The combined response holds other callers' code and answers,
+                # so a request the model skipped is re-run on its own
+                retries.append(self._invoke_alone(content, config, future))
+        if retries:
+            logger.warning("Batched response missed %d of %d requests; re-running them", len(retries), len(batch))
+            await asyncio.gather(*retries)
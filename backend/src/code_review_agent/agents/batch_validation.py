@@ -0,0 +1,159 @@
+"""
+Batch Validation - Submits validation requests through the OpenAI Batch API.
+
+For non-interactive reviews (e.g. CI runs) latency doesn't matter, so
+requests are buffered, written to a JSONL file and submitted as a single
+batch job at half the per-token price. Each caller awaits a future that
+resolves once the job finishes. Used when the graph state sets batch_mode.
+"""
+import asyncio
+import json
+import logging
+from openai import AsyncOpenAI
+from src.code_review_agent.http_client import SHARED_HTTPX
+from src.code_review_agent.llm import resolve_llm_config
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+_processor = None
+
+
+class BatchValidationProcessor:
+    """
+    Buffers chat requests and resolves them from OpenAI batch jobs.
+
+    Requests arriving within max_wait_s (up to max_batch of them) share one
+    job. Jobs are polled in the background, so new requests keep being
+    collected while earlier jobs are still running.
+    """
+
+    def __init__(self, max_batch: int = 100, max_wait_s: float = 30.0, poll_interval_s: float = 30.0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_s
+        self.poll_interval = poll_interval_s
+        self._client = None
+        self._model = None
+        self._queue = None
+        self._worker = None
+        self._jobs = set()
+
+    async def submit(self, messages: list) -> str:
+        """Queue a chat request and wait for the batch job to answer it."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        payload = [
+            {"role": _ROLES.get(message.type, "user"), "content": message.content}
+            for message in messages
+        ]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future))
+        return await future
+
+    async def _run(self):
+        """Collect requests until the batch is full or the wait window expires."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Jobs can take a long time; poll them without blocking collection
+            job = asyncio.create_task(self._flush(batch))
+            self._jobs.add(job)
+            job.add_done_callback(self._jobs.discard)
+
+    def _get_client(self) -> AsyncOpenAI:
+        """Create the API client on first use."""
+        if self._client is None:
+            model, base_url, api_key = resolve_llm_config()
+            self._client = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=SHARED_HTTPX)
+            self._model = model
+        return self._client
+
+    async def _flush(self, batch: list):
+        """Submit one batch job for the buffered requests and fulfill each future."""
+        batch = [(payload, future) for payload, future in batch if not future.done()]
+        if not batch:
+            return
+
+        try:
+            results = await self._run_job([payload for payload, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            result = results.get(str(i))
+            if isinstance(result, str):
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(f"Batch request failed: {result or 'missing from output'}"))
+
+    async def _run_job(self, payloads: list) -> dict:
+        """
+        Upload, run and collect one batch job.
+
+        Returns:
+            dict: {custom_id: response text, or the error for failed requests}
+        """
+        client = self._get_client()
+        lines = "\n".join(
+            json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": self._model, "messages": payload},
+            })
+            for i, payload in enumerate(payloads)
+        )
+        input_file = await client.files.create(
+            file=("validation_batch.jsonl", lines.encode()), purpose="batch"
+        )
+        job = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info("Submitted validation batch %s with %d requests", job.id, len(payloads))
+
+        while job.status not in _TERMINAL_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            job = await client.batches.retrieve(job.id)
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"Validation batch {job.id} ended with status {job.status}")
+
+        output = await client.files.content(job.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                results[record["custom_id"]] = record.get("error") or response.get("body")
+        return results
+
+
+def get_batch_validation_processor() -> BatchValidationProcessor:
+    """Lazily create and return the shared batch processor."""
+    global _processor
+    if _processor is None:
+        _processor = BatchValidationProcessor()
+    return _processor
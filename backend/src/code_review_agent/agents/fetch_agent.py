@@ -1,24 +1,38 @@
 """
 Fetch Agent - Reads files and explores codebase structure.
 """
-import os
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
 from langgraph.prebuilt import create_react_agent
+from src.code_review_agent.llm import get_llm, resolve_llm_config
 from src.code_review_agent.tools.file_tools import read_file, list_directory, get_file_info
+from src.code_review_agent.tools.ast_tools import analyze_files
 from src.code_review_agent.prompts.prompts import FETCH_AGENT_PROMPT
 
 
-def create_fetch_agent(llm: ChatOpenAI = None):
-    """Create and return the fetch agent."""
-    if llm is None:
-        llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-        )
+@lru_cache(maxsize=4)
+def _build_fetch_agent(model: str, base_url: str | None, api_key: str | None):
+    """Build the fetch agent once per (model, base_url, api_key)."""
+    llm = get_llm(model, base_url, api_key)
     
-    tools = [read_file, list_directory, get_file_info]
+    tools = [read_file, list_directory, get_file_info, analyze_files]
     agent = create_react_agent(
         model=llm,
         tools=tools,
         prompt=FETCH_AGENT_PROMPT
     )
     return agent
+
+
+def create_fetch_agent(
+    model: str | None = None,
+    base_url: str | None = None,
+    api_key: str | None = None,
+):
+    """
+    Create and return the fetch agent.
+    
+    Agents are cached per process, so the LLM client and react graph are
+    only built once for a given configuration.
+    """
+    model, base_url, api_key = resolve_llm_config(model, base_url, api_key)
+    return _build_fetch_agent(model, base_url, api_key)
@@ -3,12 +3,33 @@ Entry Node - Extracts code from CopilotKit context.
 
 This is the first node in the graph flow.
 """
+import logging
+import os
 import time
 from langchain_core.runnables import RunnableConfig
 from src.code_review_agent.state import CodeReviewState
-from src.code_review_agent.agents.nodes.utils import extract_code_from_copilotkit_context
+from src.code_review_agent.agents.nodes.utils import (
+    extract_code_from_copilotkit_context,
+    explain_cache,
+    explain_cache_key,
+)
 from src.code_review_agent.error_handler import error_handler, ErrorCategory, Severity
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on code sent to the LLMs; longer input keeps its head and tail
+MAX_CODE_CHARS = int(os.getenv("MAX_CODE_CHARS", "16000"))
+TRUNCATION_MARKER = "\n# ...[truncated]...\n"
+
+
+def truncate_code(user_code: str, max_chars: int = MAX_CODE_CHARS) -> str:
+    """Trim code longer than max_chars, keeping its beginning and end."""
+    if len(user_code) <= max_chars:
+        return user_code
+    half = max_chars // 2
+    # Slice the tail from an explicit start: user_code[-0:] would be the whole string
+    return user_code[:half] + TRUNCATION_MARKER + user_code[len(user_code) - half:]
+
 
 async def entry_node(
     state: CodeReviewState, config: RunnableConfig
@@ -26,12 +47,9 @@ async def entry_node(
     with error_handler.track_operation("entry_node", request_id=request_id, state=state):
         try:
             node_start_time = time.time()
-            print("=" * 50)
-            print("🚀 GRAPH EXECUTION STARTED")
-            print("=" * 50)
-            print("GRAPH FLOW: entry_node → validation_node → analyzer_node → summarizer_node → __end__")
-            print("=" * 50)
-            print("ENTRY_NODE CALLED")
+            logger.info("🚀 GRAPH EXECUTION STARTED")
+            logger.debug("GRAPH FLOW: entry_node → (validation_node | analyzer_node) → summarizer_node → __end__")
+            logger.debug("ENTRY_NODE CALLED")
             
             # CRITICAL: Preserve ALL CopilotKit code extraction exactly as-is
             # Get frontend tools from CopilotKit
@@ -63,13 +81,21 @@ async def entry_node(
                 )
                 user_code = ""
             
+            # Normalize once so downstream nodes can rely on user_code being a str
+            if not isinstance(user_code, str):
+                user_code = str(user_code) if user_code else ""
             code_found = bool(user_code)
-            code_length = len(str(user_code)) if user_code else 0
+            code_length = len(user_code)
+            
+            # Truncate once here so every downstream prompt reuses the trimmed code
+            if code_length > MAX_CODE_CHARS:
+                user_code = truncate_code(user_code)
+                logger.info("Truncated user code from %d to %d chars", code_length, len(user_code))
             messages_count = len(state.get('messages', []))
             
-            print(f"USER CODE FOUND: {code_found}")
-            print(f"USER CODE LENGTH: {code_length}")
-            print(f"MESSAGES COUNT: {messages_count}")
+            logger.debug("USER CODE FOUND: %s", code_found)
+            logger.debug("USER CODE LENGTH: %d", code_length)
+            logger.debug("MESSAGES COUNT: %d", messages_count)
             
             if not code_found:
                 error_handler.log_error(
@@ -84,14 +110,20 @@ async def entry_node(
                     }
                 )
             
+            # Identical code reviewed recently: skip straight to the summarizer
+            use_cache = code_found and not state.get("bypass_cache", False)
+            cached_summary = explain_cache.get(explain_cache_key(user_code), "") if use_cache else ""
+            
             node_elapsed = time.time() - node_start_time
-            print(f"[PERF] entry_node took {node_elapsed:.2f}s")
-            print("✅ ENTRY_NODE COMPLETED - Routing to validation_node")
+            logger.info("[PERF] entry_node took %.2fs", node_elapsed)
+            if cached_summary:
+                logger.debug("✅ ENTRY_NODE COMPLETED - Cache hit, routing to summarizer_node")
+            else:
+                logger.debug("✅ ENTRY_NODE COMPLETED - Routing to validation_node and analyzer_node")
             
-            # Note: We don't need to store user_code in state since it's already in copilotkit.context
-            # Each node will extract it from copilotkit context directly
-            # This avoids state merging issues with LangGraph
-            return {}
+            # Store the extracted code in state so downstream nodes don't
+            # have to re-walk the CopilotKit context
+            return {"user_code": user_code, "cached_summary": cached_summary}
             
         except Exception as e:
             error_handler.log_error(
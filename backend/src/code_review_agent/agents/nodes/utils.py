@@ -3,7 +3,58 @@ Utility functions for graph nodes.
 
 Shared utilities used across multiple nodes.
 """
-import json
+import asyncio
+import hashlib
+import os
+from functools import lru_cache
+import openai
+import orjson
+from langchain_core.messages import AIMessage
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from src.code_review_agent.cache import TTLCache
+from src.code_review_agent.concurrency import LLM_LIMITER
+from src.code_review_agent.llm import resolve_llm_config
+from src.code_review_agent.error_handler import error_handler, ErrorCategory, Severity
+
+# Per-attempt timeout for LLM calls and cap for retry backoff (seconds)
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "30"))
+MAX_RETRY_DELAY_S = 4.0
+
+# Errors worth retrying; anything else (auth, bad request, ...) fails immediately
+TRANSIENT_LLM_ERRORS = (
+    asyncio.TimeoutError,
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+# Retry strategies are stateless, so build them once instead of per call
+_RETRY_WAIT = wait_exponential_jitter(initial=1, max=MAX_RETRY_DELAY_S, jitter=1)
+_RETRY_ON = retry_if_exception_type(TRANSIENT_LLM_ERRORS)
+
+# Final review summaries keyed by (code, model), so repeat submissions skip the graph
+explain_cache = TTLCache(maxsize=512, ttl=3600)
+
+
+@lru_cache(maxsize=128)
+def _decode_json_str(value: str):
+    """
+    Decode a JSON-escaped string, returning it unchanged if it isn't JSON.
+    
+    Memoized so resubmitting the same code skips re-parsing it.
+    """
+    try:
+        return orjson.loads(value)
+    except (orjson.JSONDecodeError, TypeError):
+        return value
+
+
+def _decode_context_value(value):
+    """Decode a CopilotKit context value; non-string values are returned as is."""
+    # Only strings are JSON-escaped (and hashable for the cache)
+    if not isinstance(value, str):
+        return value
+    return _decode_json_str(value)
 
 
 def extract_code_from_copilotkit_context(state):
@@ -21,20 +72,144 @@ def extract_code_from_copilotkit_context(state):
     """
     copilotkit_context = state.get("copilotkit", {})
     context_items = copilotkit_context.get("context", [])
-    user_code = ""
     
     for item in context_items:
-        # Context is an object with .description and .value attributes
-        description = getattr(item, 'description', '') or ''
-        value = getattr(item, 'value', '') or ''
+        # Context is an object with .description and .value attributes;
+        # only look up the value on items describing code
+        description = getattr(item, 'description', None) or ''
+        if "code" not in description.lower():
+            continue
+        value = getattr(item, 'value', None)
+        if value:
+            return _decode_context_value(value)
+    
+    return ""
+
+
+def explain_cache_key(user_code: str) -> bytes:
+    """
+    Build the explain_cache key for a code snippet.
+    
+    The key includes the active model so switching models doesn't
+    return summaries produced by a different LLM.
+    
+    Args:
+        user_code: The user's code
         
-        if "code" in description.lower() and value:
-            # Value is a JSON-escaped string, parse it
-            try:
-                user_code = json.loads(value)
-            except:
-                user_code = value
-            break
+    Returns:
+        bytes: sha256 digest of the code and model name
+    """
+    model = resolve_llm_config()[0]
+    return hashlib.sha256(f"{model}\0{user_code}".encode()).digest()
+
+
+async def ainvoke_with_retry(
+    invoke,
+    node: str,
+    agent_name: str,
+    request_id: str,
+    max_retries: int = 2,
+    context: dict | None = None,
+):
+    """
+    Await an agent call with a per-attempt timeout, retrying transient errors.
+    
+    Only rate limits, connection problems, provider 5xx errors and timeouts
+    are retried, with jittered exponential backoff so concurrent requests
+    don't retry in lockstep. Permanent errors (auth, bad request) fail fast.
+    Each attempt holds a slot in the shared LLM concurrency limiter.
+    
+    Args:
+        invoke: Zero-argument callable returning the awaitable to run
+        node: Node name for tracking
+        agent_name: Human-readable agent name used in log messages
+        request_id: Request ID for tracking
+        max_retries: Maximum number of retries after the first attempt
+        context: Extra context logged if the call fails
+        
+    Returns:
+        The result of the awaited call
+        
+    Raises:
+        The last exception if all attempts fail
+    """
+    def log_retry(retry_state):
+        e = retry_state.outcome.exception()
+        attempt = retry_state.attempt_number
+        error_handler.record_retry(node)
+        error_handler.log_error(
+            category=(
+                ErrorCategory.TIMEOUT_ERROR
+                if isinstance(e, asyncio.TimeoutError)
+                else ErrorCategory.LLM_ERROR
+            ),
+            severity=Severity.WARNING,
+            message=f"Retry attempt {attempt}/{max_retries} for {agent_name}",
+            node=node,
+            exception=e,
+            request_id=request_id,
+            context={"attempt": attempt, "max_retries": max_retries}
+        )
     
-    return user_code
+    attempts = 0
+    try:
+        async for attempt in AsyncRetrying(
+            wait=_RETRY_WAIT,
+            stop=stop_after_attempt(max_retries + 1),
+            retry=_RETRY_ON,
+            before_sleep=log_retry,
+            reraise=True,
+        ):
+            with attempt:
+                attempts += 1
+                # Queue behind the concurrency cap; the timeout only covers the call itself
+                async with LLM_LIMITER:
+                    # Bound each call so a hung LLM request can't stall the graph
+                    return await asyncio.wait_for(invoke(), timeout=LLM_TIMEOUT_S)
+    except Exception as e:
+        error_handler.log_error(
+            category=ErrorCategory.LLM_ERROR,
+            severity=Severity.ERROR,
+            message=f"{agent_name.capitalize()} invocation failed after {attempts} attempt(s)",
+            node=node,
+            exception=e,
+            request_id=request_id,
+            context={**(context or {}), "attempts": attempts}
+        )
+        raise
+
 
+async def astream_agent(agent, messages: list, config) -> dict:
+    """
+    Run an agent, streaming tokens as they are generated.
+    
+    Events flow through the graph's callbacks, so CopilotKit forwards tokens
+    to the frontend while the response is still being written. Tokens are
+    grouped per model run so text from intermediate tool-calling turns isn't
+    mixed into the final answer.
+    
+    Returns:
+        dict: Agent result in the same shape as ainvoke ({"messages": [...]})
+    """
+    tokens_by_run = {}
+    last_run_id = None
+    root_run_id = None
+    final_output = None
+    async for event in agent.astream_events({"messages": messages}, config, version="v2"):
+        kind = event["event"]
+        if kind == "on_chat_model_stream":
+            content = event["data"]["chunk"].content
+            if content:
+                last_run_id = event["run_id"]
+                tokens_by_run.setdefault(last_run_id, []).append(content)
+        elif kind == "on_chain_start" and root_run_id is None:
+            # The agent's own run starts first; inside a graph node it still has
+            # parent_ids (the node and graph runs), so match on run_id instead
+            root_run_id = event["run_id"]
+        elif kind == "on_chain_end" and event["run_id"] == root_run_id:
+            final_output = event["data"].get("output")
+    
+    if last_run_id is not None:
+        return {"messages": [AIMessage(content="".join(tokens_by_run[last_run_id]))]}
+    # Provider didn't stream; fall back to the agent's final output
+    return final_output
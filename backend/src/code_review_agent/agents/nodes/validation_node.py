@@ -3,14 +3,126 @@ Validation Node - Runs the validator agent.
 
 This node validates code for issues and suggests improvements.
 """
+import asyncio
+import hashlib
+import logging
+import os
 import time
+from functools import lru_cache
+import tiktoken
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
 from src.code_review_agent.state import CodeReviewState
-from src.code_review_agent.agents.nodes.utils import extract_code_from_copilotkit_context
-from src.code_review_agent.agents.supervisor import _get_validator_agent
+from src.code_review_agent.cache import TTLCache
+from src.code_review_agent.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.code_review_agent.agents.nodes.entry_node import TRUNCATION_MARKER
+from src.code_review_agent.agents.nodes.utils import ainvoke_with_retry, astream_agent
+from src.code_review_agent.agents.supervisor import _get_validator_agent, build_single_shot_messages
+from src.code_review_agent.agents.validator_agent import VALIDATOR_TOOLS
+from src.code_review_agent.agents.batch_validation import get_batch_validation_processor
+from src.code_review_agent.prompts.prompts import VALIDATOR_AGENT_PROMPT
+from src.code_review_agent.tools.ast_tools import _cached_parse
 from src.code_review_agent.error_handler import error_handler, ErrorCategory, Severity
 
+logger = logging.getLogger(__name__)
+
+# Fail fast while the validator's provider is down instead of retrying every request
+_VALIDATOR_BREAKER = CircuitBreaker(fail_max=5, reset_timeout=30)
+
+# Request wrapper around the user's code, built once at import
+VALIDATION_REQUEST_PREAMBLE = "Please validate and check this code for issues:\n\n```python\n"
+VALIDATION_REQUEST_POSTAMBLE = "\n```"
+
+# Validator output keyed by code hash, so re-submitting the same code skips the LLM
+_VALIDATION_CACHE = TTLCache(maxsize=512, ttl=600)
+
+# Token budget for the code sent to the validator; longer code keeps its head and tail
+MAX_CODE_TOKENS = int(os.getenv("MAX_CODE_TOKENS", "8000"))
+
+# Snippets shorter than this (after stripping) aren't worth an LLM call
+MIN_VALIDATE_CHARS = 20
+
+# Longest a batch_mode request waits for its Batch API job before falling
+# back to the validator agent (jobs have a 24h completion window)
+BATCH_VALIDATION_TIMEOUT_S = float(os.getenv("BATCH_VALIDATION_TIMEOUT_S", "3600"))
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer once; None if it can't be loaded (e.g. offline)."""
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("tiktoken encoding unavailable, estimating tokens from length: %s", e)
+        return None
+
+
+def _truncate_middle(user_code: str, max_tokens: int) -> str:
+    """Trim code longer than max_tokens, keeping its beginning and end."""
+    encoding = _get_encoding()
+    if encoding is None:
+        # Rough estimate of ~4 characters per token
+        max_chars = max_tokens * 4
+        if len(user_code) <= max_chars:
+            return user_code
+        half = max_chars // 2
+        return user_code[:half] + TRUNCATION_MARKER + user_code[len(user_code) - half:]
+    tokens = encoding.encode(user_code, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return user_code
+    half = max_tokens // 2
+    return encoding.decode(tokens[:half]) + TRUNCATION_MARKER + encoding.decode(tokens[len(tokens) - half:])
+
+
+def precheck_code(user_code: str) -> str | None:
+    """
+    Cheap local checks run before calling the validator agent.
+    
+    Returns a validation result for trivial or syntactically invalid code,
+    or None if the code should go to the validator.
+    """
+    stripped = user_code.strip()
+    if len(stripped) < MIN_VALIDATE_CHARS or not any(c.isalnum() for c in stripped):
+        return "Code too short to validate meaningfully."
+    if all(not line.strip() or line.lstrip().startswith("#") for line in stripped.splitlines()):
+        return "Code contains only comments; nothing to validate."
+    # Truncated code is cut mid-statement, so it can't be parsed as a whole
+    if TRUNCATION_MARKER not in user_code:
+        try:
+            _cached_parse(user_code)
+        except SyntaxError as e:
+            return f"Syntax error on line {e.lineno}: {e.msg}. Fix this before running a full validation."
+    return None
+
+
+async def _validate_in_batch(request: str, prompt_code: str, request_id: str) -> str | None:
+    """
+    Validate through the OpenAI Batch API.
+    
+    Returns None if the job fails or doesn't finish within
+    BATCH_VALIDATION_TIMEOUT_S, so the caller can fall back to the
+    validator agent.
+    """
+    messages = await asyncio.to_thread(
+        build_single_shot_messages, VALIDATOR_AGENT_PROMPT, VALIDATOR_TOOLS, request, prompt_code
+    )
+    batch_start = time.time()
+    try:
+        validation_results = await asyncio.wait_for(
+            get_batch_validation_processor().submit(messages), BATCH_VALIDATION_TIMEOUT_S
+        )
+    except Exception as e:
+        error_handler.log_if(Severity.WARNING, lambda: dict(
+            category=ErrorCategory.LLM_ERROR,
+            message="Batched validation failed, falling back to the validator agent",
+            node="validation_node",
+            request_id=request_id,
+            context={"elapsed_s": round(time.time() - batch_start, 2)}
+        ), exception=e)
+        return None
+    logger.info("[PERF] Batched validation took %.2fs", time.time() - batch_start)
+    return validation_results
+
 
 async def validation_node(
     state: CodeReviewState, config: RunnableConfig
@@ -23,140 +135,129 @@ async def validation_node(
     with error_handler.track_operation("validation_node", request_id=request_id, state=state):
         try:
             node_start_time = time.time()
-            print("=" * 50)
-            print("VALIDATION_NODE CALLED")
+            logger.debug("VALIDATION_NODE CALLED")
             
-            # Extract code from state (either from user_code field or from copilotkit context)
+            # Code is extracted once by entry_node and stored in state
             user_code = state.get("user_code", "")
             
-            # If not in user_code, extract from CopilotKit context (same logic as entry_node)
-            if not user_code:
-                try:
-                    user_code = extract_code_from_copilotkit_context(state)
-                except Exception as e:
-                    error_handler.log_error(
-                        category=ErrorCategory.PARSING_ERROR,
-                        severity=Severity.ERROR,
-                        message="Failed to extract code from CopilotKit context in validation_node",
-                        node="validation_node",
-                        exception=e,
-                        request_id=request_id
-                    )
-                    user_code = ""
-            
-            code_length = len(str(user_code)) if user_code else 0
-            print(f"USER CODE LENGTH: {code_length}")
+            code_length = len(user_code) if isinstance(user_code, str) else 0
+            logger.debug("USER CODE LENGTH: %d", code_length)
             
             if not user_code:
-                error_handler.log_error(
+                error_handler.log_if(Severity.WARNING, lambda: dict(
                     category=ErrorCategory.VALIDATION_ERROR,
-                    severity=Severity.WARNING,
                     message="No code found in state, skipping validation",
                     node="validation_node",
                     request_id=request_id,
                     context={"code_length": code_length}
-                )
-                print("WARNING: No code found in state, skipping validation")
-                return {"validation_results": "No code provided for validation."}
+                ))
+                logger.warning("No code found in state, skipping validation")
+                return {"validation_results": "No code provided for validation.", "validation_ok": False}
+            
+            precheck_result = precheck_code(user_code)
+            if precheck_result is not None:
+                logger.debug("Skipping validator agent: %s", precheck_result)
+                return {"validation_results": precheck_result, "validation_ok": True}
+            
+            cache_key = hashlib.blake2b(user_code.encode(), digest_size=16).digest()
+            if not state.get("bypass_cache", False):
+                cached_results = _VALIDATION_CACHE.get(cache_key)
+                if cached_results is not None:
+                    logger.debug("Validation cache hit, skipping validator agent")
+                    return {"validation_results": cached_results, "validation_ok": True}
             
             # Get validator agent with error handling
             try:
                 validator_agent = _get_validator_agent()
             except Exception as e:
-                error_handler.log_error(
+                error_handler.log_if(Severity.ERROR, lambda: dict(
                     category=ErrorCategory.AGENT_ERROR,
-                    severity=Severity.ERROR,
                     message="Failed to get validator agent",
                     node="validation_node",
-                    exception=e,
                     request_id=request_id
-                )
+                ), exception=e)
                 raise
             
+            # Every token spans at least one character, so short code can't exceed
+            # the budget; only tokenize (off the event loop) when it might
+            prompt_code = user_code
+            if code_length > MAX_CODE_TOKENS:
+                prompt_code = await asyncio.to_thread(_truncate_middle, user_code, MAX_CODE_TOKENS)
+                if prompt_code is not user_code:
+                    logger.info("Truncated code for validator to %d tokens", MAX_CODE_TOKENS)
+            
             # Create request message with the code
-            request = f"Please validate and check this code for issues:\n\n```python\n{user_code}\n```"
+            request = VALIDATION_REQUEST_PREAMBLE + prompt_code + VALIDATION_REQUEST_POSTAMBLE
+            
+            # Non-interactive runs (e.g. CI) trade latency for the Batch API's lower price
+            if state.get("batch_mode", False):
+                validation_results = await _validate_in_batch(request, prompt_code, request_id)
+                if validation_results is not None:
+                    _VALIDATION_CACHE.set(cache_key, validation_results)
+                    return {"validation_results": validation_results, "validation_ok": True}
             
-            print("CALLING VALIDATOR AGENT...")
+            logger.debug("CALLING VALIDATOR AGENT...")
             validation_start = time.time()
             
             # Invoke validator agent with retry logic for transient errors
-            max_retries = 2
-            delay = 1.0
-            result = None
-            last_exception = None
-            
-            for attempt in range(max_retries + 1):
-                try:
-                    result = await validator_agent.ainvoke({
-                        "messages": [HumanMessage(content=request)]
-                    }, config)
-                    break
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_retries:
-                        error_handler._metrics["retry_counts"]["validation_node"] += 1
-                        error_handler.log_error(
-                            category=ErrorCategory.LLM_ERROR,
-                            severity=Severity.WARNING,
-                            message=f"Retry attempt {attempt + 1}/{max_retries} for validator agent",
-                            node="validation_node",
-                            exception=e,
-                            request_id=request_id,
-                            context={"attempt": attempt + 1, "max_retries": max_retries}
-                        )
-                        import asyncio
-                        await asyncio.sleep(delay)
-                        delay *= 2.0
-                    else:
-                        error_handler.log_error(
-                            category=ErrorCategory.LLM_ERROR,
-                            severity=Severity.ERROR,
-                            message="Validator agent invocation failed after retries",
-                            node="validation_node",
-                            exception=e,
-                            request_id=request_id,
-                            context={"code_length": code_length, "attempts": max_retries + 1}
-                        )
-                        raise
-            
-            if result is None:
-                raise last_exception
+            try:
+                async with _VALIDATOR_BREAKER:
+                    # Stream so the frontend sees the review while it's generated
+                    result = await ainvoke_with_retry(
+                        lambda: astream_agent(
+                            validator_agent, [HumanMessage(content=request)], config
+                        ),
+                        node="validation_node",
+                        agent_name="validator agent",
+                        request_id=request_id,
+                        context={"code_length": code_length},
+                    )
+            except CircuitOpenError:
+                error_handler.log_if(Severity.WARNING, lambda: dict(
+                    category=ErrorCategory.LLM_ERROR,
+                    message="Validator circuit open, skipping validation",
+                    node="validation_node",
+                    request_id=request_id,
+                    context={"code_length": code_length}
+                ))
+                return {"validation_results": "Validator temporarily unavailable", "validation_ok": False}
             
             validation_elapsed = time.time() - validation_start
-            print(f"[PERF] Validator agent took {validation_elapsed:.2f}s")
-            print(f"✅ Validator agent completed successfully")
+            logger.info("[PERF] Validator agent took %.2fs", validation_elapsed)
+            logger.debug("✅ Validator agent completed successfully")
             
             # Extract the last message content
             try:
                 last_message = result["messages"][-1]
                 validation_results = last_message.content if hasattr(last_message, 'content') else str(last_message)
-            except (KeyError, IndexError, AttributeError) as e:
-                error_handler.log_error(
+            except (KeyError, IndexError, AttributeError, TypeError) as e:
+                error_handler.log_if(Severity.ERROR, lambda: dict(
                     category=ErrorCategory.STATE_ERROR,
-                    severity=Severity.ERROR,
                     message="Failed to extract validation results from agent response",
                     node="validation_node",
-                    exception=e,
                     request_id=request_id,
                     context={"result_keys": list(result.keys()) if isinstance(result, dict) else "not_dict"}
-                )
+                ), exception=e)
                 validation_results = "Error: Failed to process validation results."
+                validation_ok = False
+            else:
+                _VALIDATION_CACHE.set(cache_key, validation_results)
+                validation_ok = True
             
-            print(f"VALIDATION RESULTS: {validation_results[:100]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("VALIDATION RESULTS: %s...", validation_results[:100])
             node_elapsed = time.time() - node_start_time
-            print(f"[PERF] validation_node took {node_elapsed:.2f}s")
-            print("✅ VALIDATION_NODE COMPLETED - Routing to analyzer_node")
+            logger.info("[PERF] validation_node took %.2fs", node_elapsed)
+            logger.debug("✅ VALIDATION_NODE COMPLETED - Routing to summarizer_node")
             
-            return {"validation_results": validation_results}
+            return {"validation_results": validation_results, "validation_ok": validation_ok}
             
         except Exception as e:
-            error_handler.log_error(
+            error_handler.log_if(Severity.ERROR, lambda: dict(
                 category=ErrorCategory.AGENT_ERROR,
-                severity=Severity.ERROR,
                 message="Unexpected error in validation_node",
                 node="validation_node",
-                exception=e,
                 request_id=request_id
-            )
+            ), exception=e)
             raise
 
@@ -1,26 +1,16 @@
 """
 Summarizer Agent - Combines validation and analyzer results into a comprehensive summary.
 """
-import os
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
+from src.code_review_agent.llm import shared_llm
 from src.code_review_agent.prompts.prompts import SUMMARIZER_AGENT_PROMPT
 
 
 def create_summarizer_agent(llm: ChatOpenAI = None):
     """Create and return the summarizer agent."""
     if llm is None:
-        # Use Groq if GROQ_API_KEY is set, otherwise fall back to OpenAI
-        if os.getenv("GROQ_API_KEY"):
-            llm = ChatOpenAI(
-                model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
-                api_key=os.getenv("GROQ_API_KEY"),
-                base_url="https://api.groq.com/openai/v1",
-            )
-        else:
-            llm = ChatOpenAI(
-                model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-            )
+        llm = shared_llm()
     
     # Summarizer doesn't need tools, just LLM for text summarization
     agent = create_react_agent(
@@ -5,11 +5,21 @@ This agent orchestrates:
 - Analyzer Agent: Explains what code does and how it works
 - Validator Agent: Finds issues and suggests improvements
 """
+import logging
 import os
+import re
+import ast
 import time
+import asyncio
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
+from src.code_review_agent.concurrency import LLM_LIMITER
+from src.code_review_agent.llm import shared_llm
+from src.code_review_agent.prompts.prompts import ANALYZER_AGENT_PROMPT, VALIDATOR_AGENT_PROMPT
+
+logger = logging.getLogger(__name__)
 
 # Lazy-loaded agents (created on first use)
 # _fetch_agent = None  # COMMENTED OUT - Fetch agent not used in graph nodes
@@ -35,6 +45,14 @@ def _get_analyzer_agent():
     if _analyzer_agent is None:
         from src.code_review_agent.agents.analyzer_agent import create_analyzer_agent
         _analyzer_agent = create_analyzer_agent()
+        # Micro-batch concurrent analyzer calls into a single LLM request
+        if os.getenv("BATCH_LLM") == "1":
+            from src.code_review_agent.agents.batch_queue import BatchQueue
+            _analyzer_agent = BatchQueue(
+                _analyzer_agent,
+                max_batch=int(os.getenv("BATCH_MAX_SIZE", "8")),
+                max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "30")),
+            )
     return _analyzer_agent
 
 
@@ -47,6 +65,87 @@ def _get_validator_agent():
     return _validator_agent
 
 
+async def warmup_agents(ping: bool = False) -> list:
+    """
+    Build every graph agent ahead of the first request.
+    
+    Agents are constructed in worker threads so startup doesn't block the
+    event loop. With ping=True each agent also makes one throwaway call,
+    opening keep-alive connections to the LLM provider before user traffic.
+    
+    Returns:
+        Exceptions raised while building or pinging agents (empty on success)
+    """
+    from src.code_review_agent.agents.nodes.summarizer_node import _get_summarizer_agent
+    getters = (_get_analyzer_agent, _get_validator_agent, _get_summarizer_agent)
+    results = await asyncio.gather(
+        *(asyncio.to_thread(getter) for getter in getters),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    if ping:
+        agents = [result for result in results if not isinstance(result, Exception)]
+        pings = await asyncio.gather(
+            *(
+                asyncio.wait_for(agent.ainvoke({"messages": [HumanMessage(content="ping")]}), timeout=15)
+                for agent in agents
+            ),
+            return_exceptions=True,
+        )
+        errors.extend(result for result in pings if isinstance(result, Exception))
+    return errors
+
+
+_FENCED_CODE_RE = re.compile(r"```(?:python|py)?[ \t]*\n(.*?)```", re.DOTALL)
+
+
+def _extract_request_code(request: str) -> str | None:
+    """
+    Return the Python code a tool request is about, or None if it has none.
+    
+    Fenced code blocks are used as-is (even if they don't parse, so syntax
+    errors still get reported). Otherwise the whole request counts as code
+    if it parses and contains more than bare expressions, which rules out
+    one-word prose like "hello".
+    """
+    match = _FENCED_CODE_RE.search(request)
+    if match:
+        return match.group(1)
+    try:
+        tree = ast.parse(request)
+    except (SyntaxError, ValueError):
+        return None
+    if any(not isinstance(node, ast.Expr) for node in tree.body):
+        return request
+    return None
+
+
+def build_single_shot_messages(prompt: str, tools: list, request: str, code: str) -> list:
+    """
+    Build a one-call prompt for an agent whose tools were run locally.
+    
+    The agents' tools are cheap local AST passes, so their output is
+    computed up front and handed to the model alongside the request.
+    """
+    tool_results = "\n\n".join(f"### {t.name}\n{t.invoke({'code': code})}" for t in tools)
+    return [
+        SystemMessage(content=prompt),
+        HumanMessage(content=(
+            f"{request}\n\n## Tool results\n"
+            "These tools have already been run on the code; use their output "
+            f"instead of calling them again.\n\n{tool_results}"
+        )),
+    ]
+
+
+async def _run_single_shot(prompt: str, tools: list, request: str, code: str) -> str:
+    """Answer a tool request with one LLM call instead of a ReAct loop."""
+    messages = await asyncio.to_thread(build_single_shot_messages, prompt, tools, request, code)
+    async with LLM_LIMITER:
+        response = await shared_llm().ainvoke(messages)
+    return response.content
+
+
 # ============================================================================
 # FETCH_CODE TOOL - COMMENTED OUT (not used in graph nodes)
 # ============================================================================
@@ -84,10 +183,19 @@ async def analyze_code(request: str) -> str:
         Detailed explanation of the code
     """
     start_time = time.time()
+    code = _extract_request_code(request)
+    if code is not None:
+        # Local tools are deterministic, so skip the agent's tool-selection round trips
+        from src.code_review_agent.agents.analyzer_agent import ANALYZER_TOOLS
+        content = await _run_single_shot(ANALYZER_AGENT_PROMPT, ANALYZER_TOOLS, request, code)
+        elapsed = time.time() - start_time
+        logger.debug("[PERF] analyze_code (single-shot) took %.2fs", elapsed)
+        return content
     agent = _get_analyzer_agent()
-    result = await agent.ainvoke({"messages": [{"role": "user", "content": request}]})
+    async with LLM_LIMITER:
+        result = await agent.ainvoke({"messages": [{"role": "user", "content": request}]})
     elapsed = time.time() - start_time
-    print(f"[PERF] analyze_code took {elapsed:.2f}s")
+    logger.debug("[PERF] analyze_code took %.2fs", elapsed)
     last_message = result["messages"][-1]
     return last_message.content if hasattr(last_message, 'content') else str(last_message)
 
@@ -105,10 +213,19 @@ async def validate_code(request: str) -> str:
         List of issues and improvement suggestions
     """
     start_time = time.time()
+    code = _extract_request_code(request)
+    if code is not None:
+        # Local tools are deterministic, so skip the agent's tool-selection round trips
+        from src.code_review_agent.agents.validator_agent import VALIDATOR_TOOLS
+        content = await _run_single_shot(VALIDATOR_AGENT_PROMPT, VALIDATOR_TOOLS, request, code)
+        elapsed = time.time() - start_time
+        logger.debug("[PERF] validate_code (single-shot) took %.2fs", elapsed)
+        return content
     agent = _get_validator_agent()
-    result = await agent.ainvoke({"messages": [{"role": "user", "content": request}]})
+    async with LLM_LIMITER:
+        result = await agent.ainvoke({"messages": [{"role": "user", "content": request}]})
     elapsed = time.time() - start_time
-    print(f"[PERF] validate_code took {elapsed:.2f}s")
+    logger.debug("[PERF] validate_code took %.2fs", elapsed)
     last_message = result["messages"][-1]
     return last_message.content if hasattr(last_message, 'content') else str(last_message)
 
@@ -1,32 +1,23 @@
 """
 Validator Agent - Finds issues and suggests improvements.
 """
-import os
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
+from src.code_review_agent.llm import shared_llm
 from src.code_review_agent.tools.validation_tools import check_syntax, find_common_issues, suggest_improvements
 from src.code_review_agent.prompts.prompts import VALIDATOR_AGENT_PROMPT
 
+VALIDATOR_TOOLS = [check_syntax, find_common_issues, suggest_improvements]
+
 
 def create_validator_agent(llm: ChatOpenAI = None):
     """Create and return the validator agent."""
     if llm is None:
-        # Use Groq if GROQ_API_KEY is set, otherwise fall back to OpenAI
-        if os.getenv("GROQ_API_KEY"):
-            llm = ChatOpenAI(
-                model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
-                api_key=os.getenv("GROQ_API_KEY"),
-                base_url="https://api.groq.com/openai/v1",
-            )
-        else:
-            llm = ChatOpenAI(
-                model=os.getenv("OPENAI_MODEL", "gpt-4o"),
-            )
+        llm = shared_llm()
     
-    tools = [check_syntax, find_common_issues, suggest_improvements]
     agent = create_react_agent(
         model=llm,
-        tools=tools,
+        tools=VALIDATOR_TOOLS,
         prompt=VALIDATOR_AGENT_PROMPT
     )
     return agent
@@ -0,0 +1,57 @@
+"""
+Circuit breaker for LLM provider calls.
+
+After a run of consecutive failures the breaker opens and calls are
+rejected immediately, instead of each request burning its full retry
+budget against a provider that is down. Once the reset timeout passes a
+single trial call is let through (half-open); success closes the breaker,
+failure re-opens it.
+"""
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Async context manager implementing a closed/open/half-open breaker.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    async def __aenter__(self):
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError("Circuit open, rejecting call")
+        if state == "half_open":
+            self._trial_in_flight = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._trial_in_flight = False
+        if exc is None:
+            self._failures = 0
+            self._opened_at = None
+        elif isinstance(exc, Exception):
+            self._failures += 1
+            # A failed trial call re-opens immediately
+            if self._opened_at is not None or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+        return False
@@ -0,0 +1,53 @@
+"""
+Admission control for LLM calls.
+
+Caps the number of in-flight agent invocations so bursts queue locally
+instead of flooding the provider with requests that come back as 429s.
+The cap adapts AIMD-style: halved on a rate limit, grown by one after a
+window of successful calls.
+"""
+import asyncio
+import os
+
+import openai
+
+
+class AIMDLimiter:
+    """
+    Async context manager limiting concurrent calls to an adaptive budget.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, max_limit: int = 16, min_limit: int = 1):
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = max(min(min_limit, self.max_limit), 1)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if isinstance(exc, openai.RateLimitError):
+            # Multiplicative decrease: back off hard while the provider throttles us
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._successes = 0
+        elif exc is None and self.limit < self.max_limit:
+            # Additive increase: one extra slot per full window of successes
+            self._successes += 1
+            if self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+
+LLM_LIMITER = AIMDLimiter(max_limit=int(os.getenv("LLM_MAX_CONCURRENCY", "16")))
@@ -15,16 +15,24 @@ Features:
 - Contextual error information
 """
 import os
+import asyncio
+import atexit
 import json
 import logging
+import queue
+import random
 import traceback
 import uuid
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Dict, Any, Optional, Callable
 from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 from collections import defaultdict
-from threading import Lock
+from threading import Event, Lock, Thread, local
 import time
 
 
@@ -48,70 +56,352 @@ class Severity(Enum):
     INFO = "info"
 
 
-class ErrorHandler:
+class _LazyTB:
     """
-    Production-scale error handler with structured logging, metrics, and tracking.
+    An exception's formatted traceback, built the first time it is rendered.
+    
+    Log entries hold these instead of strings, so the traceback is only
+    formatted if the entry is actually serialized.
+    """
+    
+    __slots__ = ("exc", "_text")
+    
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+        self._text = None
+    
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(traceback.TracebackException.from_exception(self.exc).format())
+        return self._text
+    
+    __repr__ = __str__
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """One structured log record; serialized to JSON through _ENCODE."""
+    
+    timestamp: str
+    request_id: str
+    node: str
+    error_type: str
+    severity: str
+    message: str
+    context: Dict[str, Any]
+    metrics: Dict[str, Any]
+    exception: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the entry; exception is omitted when there is none."""
+        entry = {
+            "timestamp": self.timestamp,
+            "request_id": self.request_id,
+            "node": self.node,
+            "error_type": self.error_type,
+            "severity": self.severity,
+            "message": self.message,
+            "context": self.context,
+            "metrics": self.metrics,
+        }
+        if self.exception is not None:
+            entry["exception"] = self.exception
+        return entry
+
+
+def _json_default(obj):
+    """Serialize LogEntry records; render anything else (e.g. _LazyTB) with str."""
+    if isinstance(obj, LogEntry):
+        return obj.to_dict()
+    return str(obj)
+
+
+# Compact JSON encoder built once; _json_default keeps non-serializable
+# context values from raising
+_ENCODE = json.JSONEncoder(separators=(",", ":"), default=_json_default).encode
+
+# Most requests kept in _request_tracking; the oldest are evicted first
+MAX_TRACKED_REQUESTS = 10_000
+
+# Metric updates are spread over this many locks (power of two) so that
+# concurrent nodes updating different keys don't serialize on one lock
+_NUM_SHARDS = 16
+
+# Per-thread free lists of OperationTracker objects, reused across node executions
+_TRACKER_POOL = local()
+_TRACKER_POOL_SIZE = 64
+
+# Positions of the counters in each node's outcome array
+_SUCCESS, _FAILURE = 0, 1
+
+# Pending webhook entries kept before new ones are dropped, and most sent per POST
+_WEBHOOK_QUEUE_SIZE = 1024
+_WEBHOOK_BATCH_SIZE = 50
+
+# How long get_metrics may serve a cached snapshot (seconds)
+_METRICS_SNAPSHOT_TTL_S = 1.0
+
+# (second, "YYYY-MM-DDTHH:MM:SS") for the most recent timestamp; swapped as one
+# tuple so concurrent readers never see a second paired with another's string
+_ts_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO 8601, formatting the date part once per second."""
+    global _ts_cache
+    t = time.time()
+    second = int(t)
+    cached_second, prefix = _ts_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{int((t - second) * 1e6):06d}Z"
+
+
+# Enum values and error_counts keys, built once so log_error only does lookups
+_CAT_VAL = {c: c.value for c in ErrorCategory}
+_SEV_VAL = {s: s.value for s in Severity}
+_ERR_KEYS = {(c, s): f"{c.value}_{s.value}" for c in ErrorCategory for s in Severity}
+
+# Logging level each severity is emitted at
+_LEVEL = {
+    Severity.CRITICAL: logging.CRITICAL,
+    Severity.ERROR: logging.ERROR,
+    Severity.WARNING: logging.WARNING,
+    Severity.INFO: logging.INFO,
+}
+
+
+# Exception classes mapped to categories; matched along the raised type's MRO
+_CATEGORY_MAP: Dict[type, ErrorCategory] = {
+    TimeoutError: ErrorCategory.TIMEOUT_ERROR,
+    asyncio.TimeoutError: ErrorCategory.TIMEOUT_ERROR,
+    ConnectionError: ErrorCategory.NETWORK_ERROR,
+    SyntaxError: ErrorCategory.VALIDATION_ERROR,
+}
+try:
+    import openai
+    _CATEGORY_MAP[openai.OpenAIError] = ErrorCategory.LLM_ERROR
+except ImportError:
+    pass
+try:
+    import httpx
+    _CATEGORY_MAP[httpx.TimeoutException] = ErrorCategory.TIMEOUT_ERROR
+    _CATEGORY_MAP[httpx.NetworkError] = ErrorCategory.NETWORK_ERROR
+except ImportError:
+    pass
+
+# Resolved category per raised exception type
+_CATEGORY_CACHE: Dict[type, ErrorCategory] = {}
+
+
+def _categorize_by_name(type_name: str) -> ErrorCategory:
+    """Guess a category from an exception type's name."""
+    if "LLM" in type_name or "OpenAI" in type_name or "API" in type_name:
+        return ErrorCategory.LLM_ERROR
+    if "timeout" in type_name.lower():
+        return ErrorCategory.TIMEOUT_ERROR
+    if "Network" in type_name or "Connection" in type_name:
+        return ErrorCategory.NETWORK_ERROR
+    if "Validation" in type_name or "Syntax" in type_name:
+        return ErrorCategory.VALIDATION_ERROR
+    if "State" in type_name:
+        return ErrorCategory.STATE_ERROR
+    return ErrorCategory.UNKNOWN_ERROR
+
+
+def _categorize(exc_type: type) -> ErrorCategory:
+    """
+    Return the error category for an exception type.
+    
+    Known classes are matched along the MRO; other types fall back to a
+    name-based guess. The result is cached per type.
+    """
+    category = _CATEGORY_CACHE.get(exc_type)
+    if category is None:
+        category = next(
+            (_CATEGORY_MAP[cls] for cls in exc_type.__mro__ if cls in _CATEGORY_MAP),
+            None,
+        ) or _categorize_by_name(str(exc_type))
+        _CATEGORY_CACHE[exc_type] = category
+    return category
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that writes through a large buffer.
     
-    Singleton pattern for global error tracking across the application.
+    FileHandler flushes after every record (one write syscall per error);
+    this one flushes at most once per flush_interval, plus immediately for
+    ERROR and CRITICAL records. A background thread also flushes every
+    flush_interval, so records don't sit in the buffer when logging goes
+    quiet. Anything still buffered is flushed on close.
     """
     
-    _instance = None
-    _lock = Lock()
+    def __init__(self, filename: str, buffer_size: int = 64 * 1024, flush_interval: float = 1.0):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._stop_flushing = Event()
+        super().__init__(filename)
+        self._flusher = Thread(target=self._flush_periodically, name="log-file-flusher", daemon=True)
+        self._flusher.start()
     
-    def __new__(cls):
-        """Singleton pattern implementation."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(ErrorHandler, cls).__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+    def _open(self):
+        return open(
+            self.baseFilename, self.mode, buffering=self.buffer_size,
+            encoding=self.encoding, errors=self.errors,
+        )
+    
+    def emit(self, record: logging.LogRecord):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self._flush_now()
+    
+    def flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_now()
+    
+    def _flush_now(self):
+        with self.lock:
+            self._last_flush = time.monotonic()
+            super().flush()
+    
+    def _flush_periodically(self):
+        while not self._stop_flushing.wait(self.flush_interval):
+            self._flush_now()
+    
+    def close(self):
+        self._stop_flushing.set()
+        self._flush_now()
+        super().close()
+
+
+class _NodeStats:
+    """Running per-node aggregates, updated as operations start and finish."""
+    
+    __slots__ = ("executions", "sum_duration", "count_duration")
+    
+    def __init__(self):
+        self.executions = 0
+        self.sum_duration = 0.0
+        self.count_duration = 0
+    
+    def average_duration(self) -> float:
+        return self.sum_duration / self.count_duration if self.count_duration else 0
+
+
+class _ErrorHandler:
+    """
+    Production-scale error handler with structured logging, metrics, and tracking.
+    
+    Instantiated once at import as the module-level error_handler, which is
+    shared for global error tracking across the application.
+    """
     
     def __init__(self):
         """Initialize the error handler."""
-        if self._initialized:
-            return
-        
-        self._initialized = True
-        self._request_tracking: Dict[str, Dict[str, Any]] = {}
+        self._request_tracking: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tracking_lock = Lock()
+        self._active_requests = 0
         self._metrics: Dict[str, Any] = {
             "error_counts": defaultdict(int),
-            "node_executions": defaultdict(int),
-            "node_durations": defaultdict(list),
             "retry_counts": defaultdict(int),
-            "success_rates": defaultdict(lambda: {"success": 0, "failure": 0}),
         }
+        self._node_stats: Dict[str, _NodeStats] = defaultdict(_NodeStats)
+        # Per-node [success, failure] counters, each guarded by the node's shard lock
+        self._outcomes: Dict[str, array] = {}
+        self._metrics_snapshot: Optional[Dict[str, Any]] = None
+        self._metrics_snapshot_time = 0.0
+        self._metrics_snapshot_lock = Lock()
+        self._shards = tuple(Lock() for _ in range(_NUM_SHARDS))
         self._circuit_breakers: Dict[str, Dict[str, Any]] = {}
         self._logger = None
+        self._console_handler = None
         self._file_logger = None
+        self._file_handler = None
+        self._file_logger_enabled = False
         self._setup_logging()
+        self._setup_external_services()
     
     def _setup_logging(self):
-        """Setup structured logging to both console and file."""
-        # Create logs directory if it doesn't exist
-        log_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "logs")
-        os.makedirs(log_dir, exist_ok=True)
+        """
+        Setup structured logging to the console, and to a file when
+        AGENT_LOG_TO_FILE=1. AGENT_LOG_LEVEL sets the lowest severity written
+        (INFO by default).
+        """
+        level = logging.getLevelName(os.getenv("AGENT_LOG_LEVEL", "INFO").upper())
+        if not isinstance(level, int):
+            level = logging.INFO
         
         # Setup console logger (structured JSON)
         self._logger = logging.getLogger("error_handler")
         self._logger.setLevel(logging.INFO)
+        # Has its own handlers; don't duplicate records through the root logger
+        self._logger.propagate = False
         
         # Console handler with JSON formatter
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        self._logger.addHandler(console_handler)
+        self._console_handler = logging.StreamHandler()
+        self._console_handler.setLevel(level)
+        self._logger.addHandler(self._console_handler)
         
-        # File handler for persistent logging
-        log_file = os.path.join(log_dir, f"agent_errors_{datetime.now().strftime('%Y%m%d')}.log")
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
         self._file_logger = logging.getLogger("error_handler_file")
         self._file_logger.setLevel(logging.INFO)
-        self._file_logger.addHandler(file_handler)
+        self._file_logger.propagate = False
+        self._file_logger_enabled = os.getenv("AGENT_LOG_TO_FILE", "0") == "1"
+        if not self._file_logger_enabled:
+            self._file_logger.addHandler(logging.NullHandler())
+            return
+        
+        # Create logs directory if it doesn't exist
+        log_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        
+        # File handler for persistent logging. Records are handed to a
+        # background thread that writes them in buffered batches, so the
+        # calling node never waits on disk I/O
+        log_file = os.path.join(log_dir, f"agent_errors_{datetime.now().strftime('%Y%m%d')}.log")
+        self._file_handler = _BufferedFileHandler(log_file)
+        self._file_handler.setLevel(level)
+        log_queue = queue.SimpleQueue()
+        self._file_listener = QueueListener(log_queue, self._file_handler, respect_handler_level=True)
+        self._file_listener.start()
+        atexit.register(self._file_listener.stop)
+        self._file_logger.addHandler(QueueHandler(log_queue))
+    
+    def _shard(self, key: str) -> Lock:
+        """Return the lock guarding metrics stored under key."""
+        return self._shards[hash(key) & (_NUM_SHARDS - 1)]
+    
+    def _increment(self, metric: str, key: str):
+        """Increment a per-key counter metric under its shard lock."""
+        with self._shard(key):
+            self._metrics[metric][key] += 1
+    
+    def _record_outcome(self, node: str, outcome: str):
+        """Count a success or failure for a node under its shard lock."""
+        index = _SUCCESS if outcome == "success" else _FAILURE
+        with self._shard(node):
+            counts = self._outcomes.get(node)
+            if counts is None:
+                counts = self._outcomes[node] = array("q", (0, 0))
+            counts[index] += 1
+    
+    def _calculate_success_rate(self, node: str) -> float:
+        """Calculate success rate for a node. Caller holds the node's shard lock."""
+        counts = self._outcomes.get(node)
+        if counts is None:
+            return 1.0
+        total = counts[_SUCCESS] + counts[_FAILURE]
+        return counts[_SUCCESS] / total if total else 1.0
+    
+    def record_retry(self, node: str):
+        """Count a retry attempt for a node."""
+        self._increment("retry_counts", node)
     
     def _generate_request_id(self) -> str:
         """Generate a unique request ID for tracking."""
-        return str(uuid.uuid4())
+        return uuid.uuid4().hex
     
     def _get_request_id(self, state: Optional[Dict] = None) -> str:
         """Get or generate request ID from state or create new one."""
@@ -129,27 +419,39 @@ class ErrorHandler:
         exception: Optional[Exception] = None,
         context: Optional[Dict[str, Any]] = None,
         metrics: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> "LogEntry":
         """Format a structured log entry."""
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "request_id": request_id,
-            "node": node,
-            "error_type": category.value,
-            "severity": severity.value,
-            "message": message,
-            "context": context or {},
-            "metrics": metrics or {},
-        }
-        
+        exception_info = None
         if exception:
-            log_entry["exception"] = {
+            exception_info = {
                 "type": type(exception).__name__,
                 "message": str(exception),
-                "stack_trace": traceback.format_exc(),
             }
+            # Stack traces are only worth their cost for real failures
+            if severity in (Severity.CRITICAL, Severity.ERROR):
+                exception_info["stack_trace"] = _LazyTB(exception)
         
-        return log_entry
+        return LogEntry(
+            timestamp=_now_iso(),
+            request_id=request_id,
+            node=node,
+            error_type=_CAT_VAL[category],
+            severity=_SEV_VAL[severity],
+            message=message,
+            context=context or {},
+            metrics=metrics or {},
+            exception=exception_info,
+        )
+    
+    def _emit_targets(self, level: int):
+        """Return (to_console, to_file): whether each handler would write a record at level."""
+        to_console = self._logger.isEnabledFor(level) and level >= self._console_handler.level
+        to_file = (
+            self._file_logger_enabled
+            and self._file_logger.isEnabledFor(level)
+            and level >= self._file_handler.level
+        )
+        return to_console, to_file
     
     def log_error(
         self,
@@ -178,57 +480,79 @@ class ErrorHandler:
         req_id = request_id or self._get_request_id(state)
         
         # Update metrics
-        self._metrics["error_counts"][f"{category.value}_{severity.value}"] += 1
+        self._increment("error_counts", _ERR_KEYS[(category, severity)])
         if node != "unknown":
-            self._metrics["success_rates"][node]["failure"] += 1
+            self._record_outcome(node, "failure")
         
-        # Format log entry
-        log_entry = self._format_log_entry(
-            request_id=req_id,
-            node=node,
-            category=category,
-            severity=severity,
-            message=message,
-            exception=exception,
-            context=context,
-            metrics=self._get_node_metrics(node)
-        )
-        
-        # Log to both console and file
-        log_message = json.dumps(log_entry, indent=2)
-        
-        if severity == Severity.CRITICAL:
-            self._logger.critical(log_message)
-            self._file_logger.critical(log_message)
-        elif severity == Severity.ERROR:
-            self._logger.error(log_message)
-            self._file_logger.error(log_message)
-        elif severity == Severity.WARNING:
-            self._logger.warning(log_message)
-            self._file_logger.warning(log_message)
-        else:
-            self._logger.info(log_message)
-            self._file_logger.info(log_message)
-        
-        # Send to external services if configured
-        self._send_to_external_services(log_entry)
+        # Only build and emit the entry if some handler will write it
+        level = _LEVEL[severity]
+        to_console, to_file = self._emit_targets(level)
+        if to_console or to_file:
+            # Format log entry
+            log_entry = self._format_log_entry(
+                request_id=req_id,
+                node=node,
+                category=category,
+                severity=severity,
+                message=message,
+                exception=exception,
+                context=context,
+                metrics=self._get_node_metrics(node)
+            )
+            
+            # Log to the console (and file, if enabled), one compact JSON line per entry
+            log_message = _ENCODE(log_entry)
+            
+            if to_console:
+                self._logger.log(level, log_message)
+            if to_file:
+                self._file_logger.log(level, log_message)
+            
+            # Send to external services if configured
+            if self._sentry_sdk is not None or self._webhook_url:
+                self._send_to_external_services(log_entry)
         
         # Update request tracking
-        if req_id not in self._request_tracking:
-            self._request_tracking[req_id] = {
+        tracking = self._request_tracking.get(req_id)
+        if tracking is None:
+            tracking = self._track_request(req_id, {
                 "start_time": time.time(),
                 "nodes": [],
                 "errors": [],
-            }
+            })
         
-        self._request_tracking[req_id]["errors"].append({
+        tracking["errors"].append({
             "node": node,
-            "category": category.value,
-            "severity": severity.value,
+            "category": _CAT_VAL[category],
+            "severity": _SEV_VAL[severity],
             "message": message,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         })
     
+    def log_if(
+        self,
+        severity: Severity,
+        build: Callable[[], Dict[str, Any]],
+        exception: Optional[Exception] = None
+    ):
+        """
+        Log an error only if a handler will write it, building it lazily.
+        
+        build() returns the remaining log_error keyword arguments and is only
+        called when the console or file handler accepts the severity, so hot
+        paths don't construct context dicts for records that would be dropped.
+        Unlike log_error, which still counts filtered records, skipped records
+        update neither error metrics nor request tracking.
+        
+        Args:
+            severity: Error severity level
+            build: Zero-argument callable returning log_error kwargs
+            exception: Exception object (optional)
+        """
+        if not any(self._emit_targets(_LEVEL[severity])):
+            return
+        self.log_error(severity=severity, exception=exception, **build())
+    
     def track_operation(
         self,
         node: str,
@@ -242,7 +566,28 @@ class ErrorHandler:
             with error_handler.track_operation("analyzer_node", state=state):
                 # ... operation code
         """
-        return OperationTracker(self, node, request_id or self._get_request_id(state))
+        req_id = request_id or self._get_request_id(state)
+        pool = getattr(_TRACKER_POOL, "trackers", None)
+        if pool:
+            tracker = pool.pop()
+            tracker._reset(self, node, req_id)
+            return tracker
+        return OperationTracker(self, node, req_id)
+    
+    def _track_request(self, req_id: str, tracking: Dict[str, Any]) -> Dict[str, Any]:
+        """Store tracking data for a request, evicting the oldest beyond the cap."""
+        with self._tracking_lock:
+            previous = self._request_tracking.pop(req_id, None)
+            if previous is not None and previous.get("status") == "in_progress":
+                self._active_requests -= 1
+            if tracking.get("status") == "in_progress":
+                self._active_requests += 1
+            self._request_tracking[req_id] = tracking
+            while len(self._request_tracking) > MAX_TRACKED_REQUESTS:
+                _, evicted = self._request_tracking.popitem(last=False)
+                if evicted.get("status") == "in_progress":
+                    self._active_requests -= 1
+        return tracking
     
     def start_request(self, request_id: Optional[str] = None) -> str:
         """
@@ -255,12 +600,12 @@ class ErrorHandler:
             Request ID
         """
         req_id = request_id or self._generate_request_id()
-        self._request_tracking[req_id] = {
+        self._track_request(req_id, {
             "start_time": time.time(),
             "nodes": [],
             "errors": [],
             "status": "in_progress",
-        }
+        })
         return req_id
     
     def complete_request(self, request_id: str, success: bool = True):
@@ -271,79 +616,150 @@ class ErrorHandler:
             request_id: Request ID
             success: Whether the request succeeded
         """
-        if request_id in self._request_tracking:
-            self._request_tracking[request_id]["status"] = "completed" if success else "failed"
-            self._request_tracking[request_id]["end_time"] = time.time()
-            self._request_tracking[request_id]["duration"] = (
-                self._request_tracking[request_id]["end_time"] -
-                self._request_tracking[request_id]["start_time"]
-            )
+        with self._tracking_lock:
+            tracking = self._request_tracking.get(request_id)
+            if tracking is None:
+                return
+            if tracking.get("status") == "in_progress":
+                self._active_requests -= 1
+            tracking["status"] = "completed" if success else "failed"
+            tracking["end_time"] = time.time()
+            tracking["duration"] = tracking["end_time"] - tracking["start_time"]
+            # Recently completed requests are evicted last
+            self._request_tracking.move_to_end(request_id)
     
     def _get_node_metrics(self, node: str) -> Dict[str, Any]:
         """Get metrics for a specific node."""
-        return {
-            "execution_count": self._metrics["node_executions"][node],
-            "average_duration": (
-                sum(self._metrics["node_durations"][node]) / len(self._metrics["node_durations"][node])
-                if self._metrics["node_durations"][node] else 0
-            ),
-            "retry_count": self._metrics["retry_counts"][node],
-            "success_rate": self._calculate_success_rate(node),
-        }
-    
-    def _calculate_success_rate(self, node: str) -> float:
-        """Calculate success rate for a node."""
-        rates = self._metrics["success_rates"][node]
-        total = rates["success"] + rates["failure"]
-        if total == 0:
-            return 1.0
-        return rates["success"] / total
+        with self._shard(node):
+            stats = self._node_stats.get(node) or _NodeStats()
+            return {
+                "execution_count": stats.executions,
+                "average_duration": stats.average_duration(),
+                "retry_count": self._metrics["retry_counts"].get(node, 0),
+                "success_rate": self._calculate_success_rate(node),
+            }
     
     def get_metrics(self) -> Dict[str, Any]:
-        """Get all collected metrics."""
-        return {
-            "error_counts": dict(self._metrics["error_counts"]),
-            "node_metrics": {
-                node: {
-                    "executions": self._metrics["node_executions"][node],
-                    "average_duration": (
-                        sum(durations) / len(durations) if durations else 0
-                    ),
-                    "success_rate": self._calculate_success_rate(node),
-                }
-                for node, durations in self._metrics["node_durations"].items()
-            },
-            "total_requests": len(self._request_tracking),
-            "active_requests": sum(
-                1 for req in self._request_tracking.values()
-                if req.get("status") == "in_progress"
-            ),
-        }
+        """
+        Get all collected metrics.
+        
+        Aggregates are maintained as operations run, so this is a snapshot
+        of per-node counters. The snapshot is reused for up to a second so
+        frequent scrapes don't rebuild it each time.
+        """
+        now = time.monotonic()
+        snapshot = self._metrics_snapshot
+        if snapshot is not None and now - self._metrics_snapshot_time < _METRICS_SNAPSHOT_TTL_S:
+            return snapshot
+        with self._metrics_snapshot_lock:
+            # Another thread may have refreshed it while we waited
+            snapshot = self._metrics_snapshot
+            if snapshot is not None and now - self._metrics_snapshot_time < _METRICS_SNAPSHOT_TTL_S:
+                return snapshot
+            node_metrics = {}
+            for node in list(self._node_stats):
+                with self._shard(node):
+                    stats = self._node_stats[node]
+                    node_metrics[node] = {
+                        "executions": stats.executions,
+                        "average_duration": stats.average_duration(),
+                        "success_rate": self._calculate_success_rate(node),
+                    }
+            snapshot = {
+                "error_counts": dict(self._metrics["error_counts"]),
+                "node_metrics": node_metrics,
+                "total_requests": len(self._request_tracking),
+                "active_requests": self._active_requests,
+            }
+            self._metrics_snapshot = snapshot
+            self._metrics_snapshot_time = time.monotonic()
+            return snapshot
     
-    def _send_to_external_services(self, log_entry: Dict[str, Any]):
-        """Send error to external monitoring services if configured."""
-        # Sentry integration (if SENTRY_DSN is set)
-        sentry_dsn = os.getenv("SENTRY_DSN")
-        if sentry_dsn and log_entry["severity"] in ["critical", "error"]:
+    def _setup_external_services(self):
+        """Read external service configuration and start the webhook sender."""
+        self._sentry_sdk = None
+        if os.getenv("SENTRY_DSN"):
             try:
                 import sentry_sdk
-                sentry_sdk.capture_exception(
-                    Exception(log_entry["message"]),
-                    contexts={"custom": log_entry}
-                )
+                self._sentry_sdk = sentry_sdk
             except ImportError:
                 pass  # Sentry SDK not installed
+            else:
+                # Sentry's transport batches events itself; just deliver what's pending at exit
+                atexit.register(sentry_sdk.flush, timeout=1.0)
         
-        # Custom webhook (if ERROR_WEBHOOK_URL is set)
-        webhook_url = os.getenv("ERROR_WEBHOOK_URL")
-        if webhook_url and log_entry["severity"] == "critical":
+        self._webhook_url = os.getenv("ERROR_WEBHOOK_URL")
+        self._webhook_session = None
+        self._webhook_queue = None
+        if self._webhook_url:
             try:
                 import requests
-                requests.post(webhook_url, json=log_entry, timeout=5)
+                from requests.adapters import HTTPAdapter
             except ImportError:
-                pass  # requests not installed
-            except Exception:
-                pass  # Don't fail if webhook fails
+                self._webhook_url = None  # requests not installed
+            else:
+                # One pooled session keeps connections to the endpoint alive across batches
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=4)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._webhook_session = session
+                # Errors are queued and POSTed in batches by a background thread,
+                # so a slow endpoint can't stall nodes
+                self._webhook_queue = queue.Queue(maxsize=_WEBHOOK_QUEUE_SIZE)
+                Thread(target=self._webhook_worker, name="error-webhook", daemon=True).start()
+                atexit.register(self._flush_webhooks)
+    
+    def _send_to_external_services(self, log_entry: "LogEntry"):
+        """Send error to external monitoring services if configured."""
+        # Sentry integration (if SENTRY_DSN is set)
+        if self._sentry_sdk is not None and log_entry.severity in ["critical", "error"]:
+            self._sentry_sdk.capture_exception(
+                Exception(log_entry.message),
+                contexts={"custom": log_entry.to_dict()}
+            )
+        
+        # Custom webhook (if ERROR_WEBHOOK_URL is set)
+        if self._webhook_url and log_entry.severity == "critical":
+            try:
+                self._webhook_queue.put_nowait(log_entry)
+            except queue.Full:
+                pass  # Endpoint can't keep up; drop rather than block the node
+    
+    def _webhook_worker(self):
+        """Drain queued webhook entries, POSTing up to _WEBHOOK_BATCH_SIZE at a time."""
+        webhook_queue = self._webhook_queue
+        while True:
+            batch = [webhook_queue.get()]
+            while len(batch) < _WEBHOOK_BATCH_SIZE:
+                try:
+                    batch.append(webhook_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._post_webhook(batch)
+    
+    def _flush_webhooks(self):
+        """Send whatever is still queued at interpreter exit."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._webhook_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._post_webhook(batch)
+    
+    def _post_webhook(self, batch: list):
+        """POST a batch of log entries to the error webhook, ignoring failures."""
+        try:
+            self._webhook_session.post(
+                self._webhook_url,
+                data=_ENCODE({"errors": batch}),
+                headers={"Content-Type": "application/json"},
+                timeout=5,
+            )
+        except Exception:
+            pass  # Don't fail if webhook fails
     
     def retry_with_backoff(
         self,
@@ -352,10 +768,12 @@ class ErrorHandler:
         initial_delay: float = 1.0,
         backoff_factor: float = 2.0,
         node: str = "unknown",
-        category: ErrorCategory = ErrorCategory.UNKNOWN_ERROR
+        category: ErrorCategory = ErrorCategory.UNKNOWN_ERROR,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = None
     ):
         """
-        Retry a function with exponential backoff.
+        Retry a function with exponential backoff and decorrelated jitter.
         
         Args:
             func: Function to retry
@@ -364,6 +782,9 @@ class ErrorHandler:
             backoff_factor: Multiplier for delay between retries
             node: Node name for tracking
             category: Error category for logging
+            max_delay: Upper bound for a single delay in seconds
+            deadline: Overall time budget in seconds; no retry is started
+                if its delay would overrun it (optional)
             
         Returns:
             Function result
@@ -371,55 +792,86 @@ class ErrorHandler:
         Raises:
             Last exception if all retries fail
         """
-        delay = initial_delay
-        last_exception = None
+        start = time.monotonic() if deadline is not None else 0.0
         
-        for attempt in range(max_retries + 1):
+        # Fast path: most calls succeed on the first attempt
+        try:
+            return func()
+        except Exception as e:
+            last_exception = e
+        
+        attempts = 1
+        delay = initial_delay
+        for attempt in range(1, max_retries + 1):
+            # Randomize each delay so concurrent callers don't retry in lockstep
+            delay = min(max_delay, random.uniform(initial_delay, delay * backoff_factor))
+            if deadline is not None and time.monotonic() - start + delay > deadline:
+                break
+            self.record_retry(node)
+            self.log_error(
+                category=category,
+                severity=Severity.WARNING,
+                message=f"Retry attempt {attempt}/{max_retries} for {node}",
+                node=node,
+                exception=last_exception,
+                context={"attempt": attempt, "max_retries": max_retries}
+            )
+            time.sleep(delay)
+            attempts += 1
             try:
                 return func()
             except Exception as e:
                 last_exception = e
-                if attempt < max_retries:
-                    self._metrics["retry_counts"][node] += 1
-                    self.log_error(
-                        category=category,
-                        severity=Severity.WARNING,
-                        message=f"Retry attempt {attempt + 1}/{max_retries} for {node}",
-                        node=node,
-                        exception=e,
-                        context={"attempt": attempt + 1, "max_retries": max_retries}
-                    )
-                    time.sleep(delay)
-                    delay *= backoff_factor
-                else:
-                    self.log_error(
-                        category=category,
-                        severity=Severity.ERROR,
-                        message=f"All retry attempts failed for {node}",
-                        node=node,
-                        exception=e,
-                        context={"attempts": max_retries + 1}
-                    )
         
+        self.log_error(
+            category=category,
+            severity=Severity.ERROR,
+            message=f"All retry attempts failed for {node}",
+            node=node,
+            exception=last_exception,
+            context={"attempts": attempts}
+        )
         raise last_exception
 
 
 class OperationTracker:
-    """Context manager for tracking operation execution."""
+    """
+    Context manager for tracking operation execution.
+    
+    Instances are pooled per thread: on exit a tracker clears its references
+    and returns itself to the pool for the next track_operation call, so it
+    must not be used after its with block ends.
+    """
+    
+    __slots__ = ("error_handler", "node", "request_id", "start_time")
+    
+    def __init__(self, error_handler: _ErrorHandler, node: str, request_id: str):
+        self._reset(error_handler, node, request_id)
     
-    def __init__(self, error_handler: ErrorHandler, node: str, request_id: str):
+    def _reset(self, error_handler: Optional[_ErrorHandler], node: Optional[str], request_id: Optional[str]):
         self.error_handler = error_handler
         self.node = node
         self.request_id = request_id
         self.start_time = None
     
+    def _release(self):
+        """Drop references and return this tracker to the thread's pool."""
+        self._reset(None, None, None)
+        pool = getattr(_TRACKER_POOL, "trackers", None)
+        if pool is None:
+            pool = _TRACKER_POOL.trackers = []
+        if len(pool) < _TRACKER_POOL_SIZE:
+            pool.append(self)
+    
     def __enter__(self):
         self.start_time = time.time()
-        self.error_handler._metrics["node_executions"][self.node] += 1
+        with self.error_handler._shard(self.node):
+            self.error_handler._node_stats[self.node].executions += 1
         
         # Track in request
-        if self.request_id in self.error_handler._request_tracking:
-            self.error_handler._request_tracking[self.request_id]["nodes"].append({
+        tracking = self.error_handler._request_tracking.get(self.request_id)
+        if tracking is not None:
+            tracking["nodes"].append({
                 "node": self.node,
                 "start_time": self.start_time,
             })
@@ -428,31 +880,22 @@ class OperationTracker:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         duration = time.time() - self.start_time
-        self.error_handler._metrics["node_durations"][self.node].append(duration)
+        with self.error_handler._shard(self.node):
+            stats = self.error_handler._node_stats[self.node]
+            stats.sum_duration += duration
+            stats.count_duration += 1
         
         # Update request tracking
-        if self.request_id in self.error_handler._request_tracking:
-            nodes = self.error_handler._request_tracking[self.request_id]["nodes"]
+        tracking = self.error_handler._request_tracking.get(self.request_id)
+        if tracking is not None:
+            nodes = tracking["nodes"]
             if nodes and nodes[-1]["node"] == self.node:
                 nodes[-1]["duration"] = duration
                 nodes[-1]["end_time"] = time.time()
         
         if exc_type is not None:
-            # Determine error category based on exception type
-            category = ErrorCategory.UNKNOWN_ERROR
-            if "LLM" in str(exc_type) or "OpenAI" in str(exc_type) or "API" in str(exc_type):
-                category = ErrorCategory.LLM_ERROR
-            elif "Timeout" in str(exc_type) or "timeout" in str(exc_type).lower():
-                category = ErrorCategory.TIMEOUT_ERROR
-            elif "Network" in str(exc_type) or "Connection" in str(exc_type):
-                category = ErrorCategory.NETWORK_ERROR
-            elif "Validation" in str(exc_type) or "Syntax" in str(exc_type):
-                category = ErrorCategory.VALIDATION_ERROR
-            elif "State" in str(exc_type):
-                category = ErrorCategory.STATE_ERROR
-            
             self.error_handler.log_error(
-                category=category,
+                category=_categorize(exc_type),
                 severity=Severity.ERROR,
                 message=f"Error in {self.node}: {str(exc_val)}",
                 node=self.node,
@@ -461,15 +904,21 @@ class OperationTracker:
             )
             
             # Mark as failure
-            self.error_handler._metrics["success_rates"][self.node]["failure"] += 1
+            self.error_handler._record_outcome(self.node, "failure")
         else:
             # Mark as success
-            self.error_handler._metrics["success_rates"][self.node]["success"] += 1
+            self.error_handler._record_outcome(self.node, "success")
         
+        self._release()
         # Return False to propagate exception
         return False
 
 
 # Global singleton instance
-error_handler = ErrorHandler()
+error_handler = _ErrorHandler()
+
+
+def ErrorHandler() -> _ErrorHandler:
+    """Return the shared error handler (kept for callers of the old class)."""
+    return error_handler
 
@@ -0,0 +1,12 @@
+"""
+Shared HTTP client for LLM providers.
+
+A single connection pool is reused by every ChatOpenAI instance so warm
+keep-alive connections skip the TCP/TLS handshake on each call.
+"""
+import httpx
+
+SHARED_HTTPX = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+    timeout=60,
+)
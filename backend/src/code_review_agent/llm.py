@@ -0,0 +1,48 @@
+"""
+Shared chat model for the agents.
+
+Every agent that uses the default provider configuration reuses one
+ChatOpenAI instance (and with it one client, rate limiter and connection
+pool) instead of constructing its own.
+"""
+import os
+from functools import lru_cache
+from langchain_openai import ChatOpenAI
+from src.code_review_agent.http_client import SHARED_HTTPX
+
+
+def resolve_llm_config(
+    model: str | None = None,
+    base_url: str | None = None,
+    api_key: str | None = None,
+) -> tuple:
+    """
+    Fill in the provider configuration from the environment.
+
+    Uses Groq if GROQ_API_KEY is set, otherwise falls back to OpenAI.
+
+    Returns:
+        tuple: (model, base_url, api_key)
+    """
+    if api_key is None and os.getenv("GROQ_API_KEY"):
+        api_key = os.getenv("GROQ_API_KEY")
+        base_url = base_url or "https://api.groq.com/openai/v1"
+        model = model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    model = model or os.getenv("OPENAI_MODEL", "gpt-4o")
+    return model, base_url, api_key
+
+
+@lru_cache(maxsize=4)
+def get_llm(model: str, base_url: str | None = None, api_key: str | None = None) -> ChatOpenAI:
+    """Build the chat model once per (model, base_url, api_key)."""
+    llm_kwargs = {"model": model, "http_async_client": SHARED_HTTPX}
+    if base_url:
+        llm_kwargs["base_url"] = base_url
+    if api_key:
+        llm_kwargs["api_key"] = api_key
+    return ChatOpenAI(**llm_kwargs)
+
+
+def shared_llm() -> ChatOpenAI:
+    """Return the chat model for the provider configured in the environment."""
+    return get_llm(*resolve_llm_config())
@@ -86,6 +86,7 @@ Your capabilities:
 - Read file contents using read_file
 - List directory structures using list_directory
 - Get file metadata using get_file_info
+- Summarize the structure and complexity of many Python files at once using analyze_files
 
 Instructions:
 1. When asked about a codebase, first list the directory to understand the structure
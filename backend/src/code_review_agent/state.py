@@ -1,14 +1,37 @@
 """
 State definition for the code review agent.
 """
+from typing import Annotated
+from langchain_core.messages import AnyMessage
+from langgraph.graph.message import add_messages
 from copilotkit import CopilotKitState
 
 
+def _last_value(current: str, update: str) -> str:
+    """Reducer that keeps the most recent write for a key."""
+    return update
+
+
 class CodeReviewState(CopilotKitState):
     """
     State for the code review agent.
     
     Inherits from CopilotKitState to integrate with CopilotKit frontend.
+    validation_node and analyzer_node run in parallel, so their results
+    use a reducer to merge concurrent writes. messages uses the add_messages
+    reducer, so nodes return only new messages. validation_ok and analysis_ok
+    mark results that came from a real review rather than a degraded
+    placeholder, so only those are cached. Setting bypass_cache forces
+    a fresh review instead of reusing cached results; batch_mode sends the
+    validator request through the OpenAI Batch API for non-interactive runs.
     """
-    pass
-
+    messages: Annotated[list[AnyMessage], add_messages]
+    request_id: str
+    user_code: str
+    cached_summary: str
+    bypass_cache: bool
+    batch_mode: bool
+    validation_results: Annotated[str, _last_value]
+    analyzer_results: Annotated[str, _last_value]
+    validation_ok: bool
+    analysis_ok: bool
@@ -1,5 +1,5 @@
 # Tools package for code review agent
-from src.code_review_agent.tools.ast_tools import parse_python_code, extract_functions, get_code_complexity
+from src.code_review_agent.tools.ast_tools import parse_python_code, extract_functions, get_code_complexity, analyze_files
 from src.code_review_agent.tools.file_tools import read_file, list_directory, get_file_info
 from src.code_review_agent.tools.validation_tools import check_syntax, find_common_issues, suggest_improvements
 
@@ -8,6 +8,7 @@ all_tools = [
     parse_python_code,
     extract_functions,
     get_code_complexity,
+    analyze_files,
     read_file,
     list_directory,
     get_file_info,
@@ -1,5 +1,37 @@
 import ast
-from langchain_core.tools import tool
+import logging
+import multiprocessing
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from threading import Lock
+from src.code_review_agent.tools.decorator import tool
+from src.code_review_agent.tools.file_tools import _read_text
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=64)
+def _parse_or_error(code: str):
+    try:
+        return ast.parse(code)
+    except SyntaxError as e:
+        return e
+
+
+def _cached_parse(code: str) -> ast.AST:
+    """
+    Parse code, reusing the tree when several tools inspect the same snippet.
+    
+    Syntax errors are cached too and re-raised on each call. Returned trees
+    are shared between callers and must not be modified.
+    """
+    result = _parse_or_error(code)
+    if isinstance(result, SyntaxError):
+        raise result.with_traceback(None)
+    return result
 
 
 @tool
@@ -13,56 +45,123 @@ def parse_python_code(code: str) -> str:
     Returns:
         A structured summary of the code
     """
+    return _parse_python_code(code)
+
+
+def _h_import(node, result):
+    for alias in node.names:
+        result["imports"].append(alias.name)
+
+
+def _h_importfrom(node, result):
+    module = node.module or ""
+    for alias in node.names:
+        result["imports"].append(f"{module}.{alias.name}")
+
+
+def _h_func(node, result):
+    args = [arg.arg for arg in node.args.args]
+    result["functions"].append({
+        "name": node.name,
+        "args": args,
+        "line": node.lineno,
+        "docstring": ast.get_docstring(node) or "No docstring"
+    })
+
+
+def _h_class(node, result):
+    methods = [n.name for n in node.body if type(n) is ast.FunctionDef]
+    result["classes"].append({
+        "name": node.name,
+        "methods": methods,
+        "line": node.lineno,
+        "docstring": ast.get_docstring(node) or "No docstring"
+    })
+
+
+def _h_assign(node, result):
+    for target in node.targets:
+        if type(target) is ast.Name:
+            result['global_variables'].append(target.id)
+
+
+def _noop(node, result):
+    pass
+
+
+def _h_block(node, result):
+    # Module-level `try:`, `if TYPE_CHECKING:`, `with ...:` etc. still define
+    # module-level names, so classify the statements in each of their bodies
+    for stmt in _block_statements(node):
+        DISPATCH.get(type(stmt), _noop)(stmt, result)
+
+
+def _block_statements(node):
+    """Statements nested directly in a compound statement's bodies."""
+    yield from getattr(node, "body", ())
+    for handler in getattr(node, "handlers", ()):
+        yield from handler.body
+    for case in getattr(node, "cases", ()):
+        yield from case.body
+    yield from getattr(node, "orelse", ())
+    yield from getattr(node, "finalbody", ())
+
+
+# Handlers for module-level statements, keyed by exact node type
+DISPATCH = {
+    ast.Import: _h_import,
+    ast.ImportFrom: _h_importfrom,
+    ast.FunctionDef: _h_func,
+    ast.ClassDef: _h_class,
+    ast.Assign: _h_assign,
+    ast.If: _h_block,
+    ast.Try: _h_block,
+    ast.With: _h_block,
+    ast.AsyncWith: _h_block,
+    ast.For: _h_block,
+    ast.AsyncFor: _h_block,
+    ast.While: _h_block,
+    ast.Match: _h_block,
+}
+if hasattr(ast, "TryStar"):
+    DISPATCH[ast.TryStar] = _h_block
+
+
+@lru_cache(maxsize=256)
+def _parse_python_code(code: str) -> str:
+    """
+    Cached implementation of parse_python_code.
+    
+    Only module-level statements are classified, including those inside
+    module-level compound statements such as `try:` or `if TYPE_CHECKING:`.
+    Methods are reported under their class and definitions nested in
+    functions or classes are not listed.
+    """
     try:
-        tree = ast.parse(code)
+        tree = _cached_parse(code)
         result = {
             "imports": [],
             "functions": [],
             "classes": [],
             "global_variables": [],
         }
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    result["imports"].append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for alias in node.names:
-                    result["imports"].append(f"{module}.{alias.name}")
-            elif isinstance(node, ast.FunctionDef):
-                args = [arg.arg for arg in node.args.args]
-                result["functions"].append({
-                    "name": node.name,
-                    "args": args,
-                    "line": node.lineno,
-                    "docstring": ast.get_docstring(node) or "No docstring"
-                })
-            elif isinstance(node, ast.ClassDef):
-                methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                result["classes"].append({
-                    "name": node.name,
-                    "methods": methods,
-                    "line": node.lineno,
-                    "docstring": ast.get_docstring(node) or "No docstring"
-                })
-            elif isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        result['global_variables'].append(target.id)
+        for node in tree.body:
+            DISPATCH.get(type(node), _noop)(node, result)
 
         output = []
-        output.append("===== Code Structure =====")
-        output.append(f"\nImports ({len(result['imports'])}):")
+        app = output.append
+        app("===== Code Structure =====")
+        app(f"\nImports ({len(result['imports'])}):")
         for imp in result['imports']:
-            output.append(f"  - {imp}")
-        output.append(f"\nFunctions ({len(result['functions'])}):")
+            app(f"  - {imp}")
+        app(f"\nFunctions ({len(result['functions'])}):")
         for func in result['functions']:
-            output.append(f"  - {func['name']}({', '.join(func['args'])}) @ line {func['line']}")
+            app(f"  - {func['name']}({', '.join(func['args'])}) @ line {func['line']}")
 
-        output.append(f"\nClasses ({len(result['classes'])}):")
+        app(f"\nClasses ({len(result['classes'])}):")
         for cls in result["classes"]:
-            output.append(f"  - {cls['name']} @ line {cls['line']}")
-            output.append(f"    Methods: {', '.join(cls['methods'])}")
+            app(f"  - {cls['name']} @ line {cls['line']}")
+            app(f"    Methods: {', '.join(cls['methods'])}")
         
         return "\n".join(output)
     except SyntaxError as e:
@@ -71,6 +170,101 @@ def parse_python_code(code: str) -> str:
         return f"Error parsing code: {str(e)}"
 
 
+# Nodes that can hold statements; expressions never contain a def
+_STMT_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+# Field names per node class, looked up once per type instead of per node
+FIELDS: dict = {}
+
+# Nodes whose body may start with a docstring
+_DOCSTRING_OWNERS = frozenset({ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef})
+
+
+def _body_start(node_type, field: str, body: list) -> int:
+    """Index of the first child worth walking: 1 when body opens with a docstring."""
+    if field == "body" and node_type in _DOCSTRING_OWNERS and body:
+        first = body[0]
+        if type(first) is ast.Expr and type(first.value) is ast.Constant and type(first.value.value) is str:
+            return 1
+    return 0
+
+
+def _iter(root):
+    """
+    Walk every node under root in the same breadth-first order as ast.walk.
+    
+    Fields are read directly from the per-type FIELDS cache rather than
+    going through ast.iter_child_nodes and ast.iter_fields for each node.
+    Docstrings are skipped; no check looks at them.
+    """
+    AST = ast.AST
+    todo = deque([root])
+    popleft = todo.popleft
+    while todo:
+        node = popleft()
+        yield node
+        node_type = type(node)
+        fields = FIELDS.get(node_type)
+        if fields is None:
+            fields = FIELDS[node_type] = node_type._fields
+        for field in fields:
+            value = getattr(node, field, None)
+            if value.__class__ is list:
+                todo.extend([child for child in value[_body_start(node_type, field, value):] if isinstance(child, AST)])
+            elif isinstance(value, AST):
+                todo.append(value)
+
+
+def _stmt_children(node):
+    """Yield the direct children of node that can hold statements."""
+    node_type = type(node)
+    fields = FIELDS.get(node_type)
+    if fields is None:
+        fields = FIELDS[node_type] = node_type._fields
+    for field in fields:
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            for child in value[_body_start(node_type, field, value):]:
+                if isinstance(child, _STMT_CONTAINERS):
+                    yield child
+        elif isinstance(value, ast.stmt):
+            yield value
+
+
+def _walk_stmts(root):
+    """
+    Breadth-first walk like ast.walk, but only through statement nodes.
+    
+    Expression subtrees are never entered, so nodes come out in the same
+    order as ast.walk with the expressions left out.
+    """
+    todo = deque([root])
+    while todo:
+        node = todo.popleft()
+        yield node
+        todo.extend(_stmt_children(node))
+
+
+# Unparsed annotation text keyed by ast.dump of the annotation; cleared when full
+_UNPARSE_CACHE: dict = {}
+_UNPARSE_CACHE_SIZE = 4096
+
+
+def _unparse(annotation: ast.AST) -> str:
+    """ast.unparse for annotations, memoized since the same types recur across signatures."""
+    # Plain names (str, int, MyClass) unparse to themselves
+    if type(annotation) is ast.Name:
+        return annotation.id
+    key = ast.dump(annotation)
+    text = _UNPARSE_CACHE.get(key)
+    if text is None:
+        if len(_UNPARSE_CACHE) >= _UNPARSE_CACHE_SIZE:
+            _UNPARSE_CACHE.clear()
+        text = _UNPARSE_CACHE[key] = ast.unparse(annotation)
+    return text
+
+
 @tool
 def extract_functions(code: str) -> str:
     """
@@ -82,22 +276,28 @@ def extract_functions(code: str) -> str:
     Returns:
         List of functions with details
     """
+    return _extract_functions(code)
+
+
+@lru_cache(maxsize=256)
+def _extract_functions(code: str) -> str:
+    """Cached implementation of extract_functions."""
     try:
-        tree = ast.parse(code)
+        tree = _cached_parse(code)
         functions = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
+        for node in _walk_stmts(tree):
+            if type(node) is ast.FunctionDef:
                 args = []
                 for arg in node.args.args:
                     arg_str = arg.arg
                     if arg.annotation:
-                        arg_str += f": {ast.unparse(arg.annotation)}"
+                        arg_str += f": {_unparse(arg.annotation)}"
                     args.append(arg_str)
                 
                 return_type = ""
                 if node.returns:
-                    return_type = f" -> {ast.unparse(node.returns)}"
+                    return_type = f" -> {_unparse(node.returns)}"
                 
                 signature = f"def {node.name}({', '.join(args)}){return_type}"
                 docstring = ast.get_docstring(node) or "No docstring"
@@ -124,8 +324,28 @@ def get_code_complexity(code: str) -> str:
     Returns:
         Complexity metrics
     """
+    return _get_code_complexity(code)
+
+
+# Counter incremented for each node type in get_code_complexity
+COMPLEXITY_METRICS = {
+    ast.FunctionDef: "functions",
+    ast.ClassDef: "classes",
+    ast.For: "loops",
+    ast.While: "loops",
+    ast.If: "conditionals",
+    ast.Try: "try_blocks",
+}
+
+# Statements that add a level of nesting
+NESTING_TYPES = frozenset({ast.For, ast.While, ast.If, ast.With, ast.Try})
+
+
+@lru_cache(maxsize=256)
+def _get_code_complexity(code: str) -> str:
+    """Cached implementation of get_code_complexity."""
     try:
-        tree = ast.parse(code)
+        tree = _cached_parse(code)
         
         metrics = {
             "total_lines": len(code.splitlines()),
@@ -137,32 +357,33 @@ def get_code_complexity(code: str) -> str:
             "nested_depth": 0
         }
         
-        def count_depth(node, current_depth=0):
-            max_depth = current_depth
-            for child in ast.iter_child_nodes(node):
-                if isinstance(child, (ast.For, ast.While, ast.If, ast.With, ast.Try)):
-                    max_depth = max(max_depth, count_depth(child, current_depth + 1))
-                else:
-                    max_depth = max(max_depth, count_depth(child, current_depth))
-            return max_depth
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                metrics["functions"] += 1
-            elif isinstance(node, ast.ClassDef):
-                metrics["classes"] += 1
-            elif isinstance(node, (ast.For, ast.While)):
-                metrics["loops"] += 1
-            elif isinstance(node, ast.If):
-                metrics["conditionals"] += 1
-            elif isinstance(node, ast.Try):
-                metrics["try_blocks"] += 1
-        
-        metrics["nested_depth"] = count_depth(tree)
+        # One iterative pass records node types and tracks nesting depth. Every
+        # counted or nesting construct is a statement, so expression subtrees
+        # are skipped
+        max_depth = 0
+        node_types = []
+        seen = node_types.append
+        stack = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            node_type = type(node)
+            seen(node_type)
+            if node_type in NESTING_TYPES:
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            stack.extend((child, depth) for child in _stmt_children(node))
+        
+        # Tally the types in C, then read off the counted ones
+        counts = Counter(node_types)
+        for node_type, metric in COMPLEXITY_METRICS.items():
+            metrics[metric] += counts[node_type]
+        metrics["nested_depth"] = max_depth
         
         output = ["=== Complexity Metrics ==="]
+        app = output.append
         for key, value in metrics.items():
-            output.append(f"{key.replace('_', ' ').title()}: {value}")
+            app(f"{key.replace('_', ' ').title()}: {value}")
         
         # Simple complexity rating
         complexity_score = (
@@ -180,9 +401,117 @@ def get_code_complexity(code: str) -> str:
         else:
             rating = "High"
         
-        output.append(f"\nOverall Complexity: {rating} (score: {complexity_score})")
+        app(f"\nOverall Complexity: {rating} (score: {complexity_score})")
         
         return "\n".join(output)
     
     except Exception as e:
         return f"Error analyzing complexity: {str(e)}"
+
+
+# Threads used to read files in analyze_files
+_READ_WORKERS = 16
+
+# Total source size above which analyze_files parses in worker processes;
+# below it, handing the sources to workers costs more than the parsing
+_PROCESS_POOL_MIN_CHARS = 1 << 20
+
+# Worker processes shared by every analyze_files call, started on first use
+_process_pool = None
+_process_pool_lock = Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get or create the shared process pool.
+    
+    Workers are spawned rather than forked: the server runs tools on
+    threads, and forking a threaded process can copy locks held by
+    other threads into the child. Spawned workers re-import __main__,
+    which is why main.py only imports the server on demand.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next call starts a fresh one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_in_processes(codes: list) -> list:
+    """Analyze sources in the shared pool, in process if the pool can't be used."""
+    pool = None
+    try:
+        pool = _get_process_pool()
+        return list(pool.map(_analyze_source, codes))
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning("analyze_files process pool failed, analyzing in process: %s", e)
+        if pool is not None:
+            _discard_process_pool(pool)
+        return list(map(_analyze_source, codes))
+
+
+@tool
+def analyze_files(paths: list[str]) -> str:
+    """
+    Analyze several Python files at once: the structure and complexity of each.
+    
+    Args:
+        paths: Paths to the Python files
+        
+    Returns:
+        Code structure and complexity metrics for every file
+    """
+    return _analyze_files(paths)
+
+
+def _read_source(path: str):
+    """Read a file for analyze_files, returning (code, error message)."""
+    try:
+        code = _read_text(path)
+    except FileNotFoundError:
+        return None, f"File not found: {path}"
+    except Exception as e:
+        return None, f"Error reading file: {str(e)}"
+    if code is None:
+        return None, f"Not a file: {path}"
+    return code, None
+
+
+def _analyze_source(code: str) -> str:
+    """Structure and complexity report for one file."""
+    return f"{_parse_python_code(code)}\n\n{_get_code_complexity(code)}"
+
+
+def _analyze_files(paths: list) -> str:
+    """Implementation of analyze_files."""
+    if not paths:
+        return "No files given."
+    
+    # Reads are I/O bound, so overlap them on threads
+    with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(paths))) as pool:
+        sources = list(pool.map(_read_source, paths))
+    codes = [code for code, _ in sources if code is not None]
+    
+    # Parsing is CPU bound; spread large batches over processes
+    if len(codes) > 1 and sum(map(len, codes)) >= _PROCESS_POOL_MIN_CHARS:
+        reports = iter(_analyze_in_processes(codes))
+    else:
+        reports = map(_analyze_source, codes)
+    
+    output = []
+    for path, (code, error) in zip(paths, sources):
+        report = error if code is None else next(reports)
+        output.append(f"##### {path} #####\n{report}")
+    return "\n\n".join(output)
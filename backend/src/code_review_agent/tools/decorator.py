@@ -0,0 +1,29 @@
+"""
+The @tool decorator used by the tool modules.
+
+Importing langchain_core.tools dominates the tools' import time. With
+CRA_NO_LANGCHAIN=1 tools stay plain functions, so scripts and worker
+processes that only call them directly skip that import.
+"""
+import os
+
+
+def _plain_tool(func):
+    """
+    Stand-in for langchain's @tool that leaves the function callable as is.
+
+    Adds the name and invoke() that callers such as
+    build_single_shot_messages use on LangChain tools.
+    """
+    def invoke(input):
+        return func(**input) if isinstance(input, dict) else func(input)
+
+    func.name = func.__name__
+    func.invoke = invoke
+    return func
+
+
+if os.getenv("CRA_NO_LANGCHAIN") == "1":
+    tool = _plain_tool
+else:
+    from langchain_core.tools import tool
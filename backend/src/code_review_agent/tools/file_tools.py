@@ -1,6 +1,16 @@
-from langchain_core.tools import tool
+from src.code_review_agent.tools.decorator import tool
+import mmap
 import os
-from pathlib import Path
+from stat import S_ISDIR, S_ISREG
+
+# Smallest os.read request; files reporting a size of 0 (e.g. in /proc) are read in these steps
+_MIN_READ_SIZE = 64 * 1024
+
+# Files larger than this are memory-mapped instead of read
+_MMAP_THRESHOLD = 1 << 20
+
+# Not available on Windows, where opening a named pipe doesn't block anyway
+_O_NONBLOCK = getattr(os, "O_NONBLOCK", 0)
 
 
 @tool
@@ -15,16 +25,49 @@ def read_file(file_path: str) -> str:
         The file contents as a string, or an error message
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
-            return f"File not found: {file_path}"
-        if not path.is_file():
-            return f"Not a file: {file_path}"
-        with open(file_path, "r") as f:
-            content = f.read()
-        return content
+        content = _read_text(file_path)
+    except FileNotFoundError:
+        return f"File not found: {file_path}"
     except Exception as e:
         return f"Error reading file: {str(e)}"
+    if content is None:
+        return f"Not a file: {file_path}"
+    return content
+
+
+def _read_text(file_path: str):
+    """
+    Read a file as UTF-8 text, replacing undecodable bytes.
+    
+    Returns None if the path is not a regular file; raises OSError
+    (e.g. FileNotFoundError) if it can't be opened.
+    """
+    # Open first and check the open descriptor, so the existence and
+    # type checks cost a single fstat. O_NONBLOCK keeps the open from
+    # waiting forever on a FIFO with no writer; it has no effect on the
+    # regular files that are actually read
+    try:
+        fd = os.open(file_path, os.O_RDONLY | _O_NONBLOCK)
+    except IsADirectoryError:
+        return None
+    try:
+        st = os.fstat(fd)
+        if not S_ISREG(st.st_mode):
+            return None
+        # Large files are decoded straight from a read-only mapping of
+        # the page cache, without first copying them into a bytes object
+        if st.st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, "utf-8", "replace")
+        # Read the raw bytes in as few calls as the size allows and decode
+        # once, skipping the text layer's incremental decoding
+        chunks = []
+        read_size = max(st.st_size, _MIN_READ_SIZE)
+        while chunk := os.read(fd, read_size):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks).decode("utf-8", errors="replace")
 
 
 @tool
@@ -39,19 +82,22 @@ def list_directory(directory_path: str) -> str:
         A formatted string showing the directory structure
     """
     try:
-        path = Path(directory_path)
-        if not path.exists():
+        try:
+            with os.scandir(directory_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
             return f"[ERROR]: Directory not found: {directory_path}"
-        if not path.is_dir():
+        except NotADirectoryError:
             return f"[ERROR]: Not a directory: {directory_path}"
         
         items = []
-        for item in sorted(path.iterdir()):
-            if item.is_dir():
-                items.append(f"📁 {item.name}/")
+        for entry in entries:
+            # scandir reports the entry type from the directory listing itself
+            if entry.is_dir():
+                items.append(f"📁 {entry.name}/")
             else:
-                size = item.stat().st_size
-                items.append(f"📄 {item.name} ({size} bytes)")
+                size = entry.stat().st_size
+                items.append(f"📄 {entry.name} ({size} bytes)")
                 
         if not items:
             return "Directory is empty"
@@ -73,16 +119,18 @@ def get_file_info(file_path: str) -> str:
         File information as a formatted string
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
             return f"[ERROR]: File not found: {file_path}"
-        stat = path.stat()
+        name = os.path.basename(os.path.normpath(file_path))
+        extension = os.path.splitext(name)[1]
         info = {
-            "name": path.name,
-            "extension": path.suffix or "none",
+            "name": name,
+            "extension": extension if len(extension) > 1 else "none",
             "size_bytes": stat.st_size,
-            "is_file": path.is_file(),
-            "is_directory": path.is_dir(),
+            "is_file": S_ISREG(stat.st_mode),
+            "is_directory": S_ISDIR(stat.st_mode),
         }
         return "\n".join([f"{key}: {value}" for key, value in info.items()])
     except Exception as e:
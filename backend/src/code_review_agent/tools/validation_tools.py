@@ -1,6 +1,8 @@
 import ast
 import re
-from langchain_core.tools import tool
+from itertools import islice
+from src.code_review_agent.tools.decorator import tool
+from src.code_review_agent.tools.ast_tools import _cached_parse, _iter
 
 
 @tool
@@ -15,12 +17,86 @@ def check_syntax(code: str) -> str:
         'Valid' or error details
     """
     try:
-        ast.parse(code)
+        _cached_parse(code)
         return "✅ Syntax is correct"
     except SyntaxError as e:
         return f"❌ Syntax Error: {str(e)}"
 
 
+# Numbers common enough not to be flagged as magic
+_MAGIC_OK = frozenset({0, 1, -1, 2, 10, 100})
+
+# Constant value types checked for magic numbers (bool is an int subclass)
+_NUMBER_TYPES = frozenset({int, float, bool})
+
+# Whole lines mentioning TODO/FIXME, and lines longer than 100 characters
+TODO_RE = re.compile(r"^.*(?:TODO|FIXME).*$", re.MULTILINE)
+LONG_RE = re.compile(r"^.{101,}", re.MULTILINE)
+
+# Line boundaries str.splitlines() recognises besides "\n"; rewritten to "\n"
+# before the scans so line numbers and text match splitlines()
+_OTHER_LINE_BREAKS = re.compile(r"\r\n?|[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+
+# Most distinct assigned names tracked for the unused-variable check, and
+# most unused names listed in its message
+_MAX_DEFINED_NAMES = 10_000
+_MAX_UNUSED_REPORTED = 20
+
+
+def _matching_lines(pattern, code: str):
+    """Yield (line number, matched text) for each match of pattern in code."""
+    lineno = 1
+    pos = 0
+    for match in pattern.finditer(code):
+        start = match.start()
+        lineno += code.count("\n", pos, start)
+        pos = start
+        yield lineno, match.group()
+
+
+def _check_bare(node, state):
+    if node.type is None:
+        state["bare_excepts"].append(f"Line {node.lineno}: Bare 'except:' clause - catch specific exceptions instead")
+
+
+def _collect_name(node, state):
+    ctx = type(node.ctx)
+    if ctx is ast.Store:
+        defined = state["defined_vars"]
+        # Past the cap, new names are ignored; uses are still recorded so
+        # already-tracked names aren't misreported as unused
+        if len(defined) < _MAX_DEFINED_NAMES:
+            defined.add(node.id)
+    elif ctx is ast.Load:
+        state["used_vars"].add(node.id)
+
+
+def _check_magic(node, state):
+    if type(node.value) in _NUMBER_TYPES and node.value not in _MAGIC_OK:
+        state["magic_numbers"].append(f"Line {node.lineno}: Magic number {node.value} - consider using a named constant")
+
+
+def _check_doc(node, state):
+    if not ast.get_docstring(node):
+        state["missing_docstrings"].append(f"Line {node.lineno}: {node.name} is missing a docstring")
+
+
+def _check_print(node, state):
+    if type(node.func) is ast.Name and node.func.id == 'print':
+        state["prints"].append(f"Line {node.lineno}: print() statement - consider using logging")
+
+
+# find_common_issues checks, keyed by the exact node type they inspect
+ISSUE_HANDLERS = {
+    ast.ExceptHandler: _check_bare,
+    ast.Name: _collect_name,
+    ast.Constant: _check_magic,
+    ast.FunctionDef: _check_doc,
+    ast.ClassDef: _check_doc,
+    ast.Call: _check_print,
+}
+
+
 @tool
 def find_common_issues(code: str) -> str:
     """
@@ -33,64 +109,53 @@ def find_common_issues(code: str) -> str:
         List of potential issues found
     """
     issues = []
-    lines = code.splitlines()
+    add = issues.append
     
     try:
-        tree = ast.parse(code)
+        tree = _cached_parse(code)
     except SyntaxError:
         return "Cannot analyze - code has syntax errors. Run check_syntax first."
     
-    # Check for common issues
+    # One walk collects every AST-based finding, grouped by check
+    state = {
+        "bare_excepts": [],
+        "defined_vars": set(),
+        "used_vars": set(),
+        "magic_numbers": [],
+        "missing_docstrings": [],
+        "prints": [],
+    }
+    for node in _iter(tree):
+        handler = ISSUE_HANDLERS.get(type(node))
+        if handler is not None:
+            handler(node, state)
     
     # 1. Bare except clauses
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ExceptHandler):
-            if node.type is None:
-                issues.append(f"Line {node.lineno}: Bare 'except:' clause - catch specific exceptions instead")
+    issues.extend(state["bare_excepts"])
     
     # 2. Unused variables (simple check)
-    defined_vars = set()
-    used_vars = set()
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Name):
-            if isinstance(node.ctx, ast.Store):
-                defined_vars.add(node.id)
-            elif isinstance(node.ctx, ast.Load):
-                used_vars.add(node.id)
-    
-    unused = defined_vars - used_vars - {'_'}
+    used = state["used_vars"]
+    unused = list(islice((v for v in state["defined_vars"] if v not in used and v != '_'), _MAX_UNUSED_REPORTED))
     if unused:
-        issues.append(f"Potentially unused variables: {', '.join(unused)}")
+        add(f"Potentially unused variables: {', '.join(unused)}")
     
     # 3. TODO/FIXME comments
-    for i, line in enumerate(lines, 1):
-        if 'TODO' in line or 'FIXME' in line:
-            issues.append(f"Line {i}: Contains TODO/FIXME - {line.strip()[:50]}")
+    text = _OTHER_LINE_BREAKS.sub("\n", code)
+    for i, line in _matching_lines(TODO_RE, text):
+        add(f"Line {i}: Contains TODO/FIXME - {line.strip()[:50]}")
     
     # 4. Long lines
-    for i, line in enumerate(lines, 1):
-        if len(line) > 100:
-            issues.append(f"Line {i}: Line too long ({len(line)} chars)")
+    for i, line in _matching_lines(LONG_RE, text):
+        add(f"Line {i}: Line too long ({len(line)} chars)")
     
     # 5. Magic numbers
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                if node.value not in (0, 1, -1, 2, 10, 100):
-                    # Check if it's in a meaningful context
-                    issues.append(f"Line {node.lineno}: Magic number {node.value} - consider using a named constant")
+    issues.extend(state["magic_numbers"])
     
     # 6. Missing docstrings
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-            if not ast.get_docstring(node):
-                issues.append(f"Line {node.lineno}: {node.name} is missing a docstring")
+    issues.extend(state["missing_docstrings"])
     
     # 7. Print statements (often forgotten debug code)
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == 'print':
-                issues.append(f"Line {node.lineno}: print() statement - consider using logging")
+    issues.extend(state["prints"])
     
     if not issues:
         return "✅ No common issues found. Code looks good!"
@@ -112,42 +177,46 @@ def suggest_improvements(code: str) -> str:
     suggestions = []
     
     try:
-        tree = ast.parse(code)
+        tree = _cached_parse(code)
     except SyntaxError:
         return "Cannot analyze - code has syntax errors."
     
-    # 1. Type hints
+    # One walk gathers what checks 1-4 need
     has_type_hints = False
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            if node.returns or any(arg.annotation for arg in node.args.args):
+    has_try_except = False
+    append_loops = []
+    open_calls = []
+    for node in _iter(tree):
+        node_type = type(node)
+        if node_type is ast.FunctionDef:
+            if not has_type_hints and (node.returns or any(arg.annotation for arg in node.args.args)):
                 has_type_hints = True
-                break
+        elif node_type is ast.Try:
+            has_try_except = True
+        elif node_type is ast.For:
+            # Simple heuristic: if for loop just appends to a list
+            if len(node.body) == 1 and type(node.body[0]) is ast.Expr:
+                call = node.body[0].value
+                if type(call) is ast.Call and getattr(call.func, 'attr', None) == 'append':
+                    append_loops.append(f"Line {node.lineno}: Consider using list comprehension instead of for loop with append")
+        elif node_type is ast.Call:
+            if type(node.func) is ast.Name and node.func.id == 'open':
+                # Check if parent is not a 'with' statement
+                open_calls.append(f"Line {node.lineno}: Use 'with' statement for file operations to ensure proper cleanup")
     
+    # 1. Type hints
     if not has_type_hints:
         suggestions.append("Add type hints to function parameters and return values for better code clarity")
     
     # 2. Error handling
-    has_try_except = any(isinstance(node, ast.Try) for node in ast.walk(tree))
     if not has_try_except:
         suggestions.append("Consider adding try/except blocks for error handling")
     
     # 3. List comprehensions
-    for node in ast.walk(tree):
-        if isinstance(node, ast.For):
-            # Simple heuristic: if for loop just appends to a list
-            if len(node.body) == 1 and isinstance(node.body[0], ast.Expr):
-                if isinstance(node.body[0].value, ast.Call):
-                    if hasattr(node.body[0].value.func, 'attr'):
-                        if node.body[0].value.func.attr == 'append':
-                            suggestions.append(f"Line {node.lineno}: Consider using list comprehension instead of for loop with append")
+    suggestions.extend(append_loops)
     
     # 4. Context managers
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == 'open':
-                # Check if parent is not a 'with' statement
-                suggestions.append(f"Line {node.lineno}: Use 'with' statement for file operations to ensure proper cleanup")
+    suggestions.extend(open_calls)
     
     # 5. Constants
     lines = code.splitlines()
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+
+from src.code_review_agent.tools import ast_tools
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write_sources(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(f"def f{i}(x):\n    if x:\n        return {i}\n    return -{i}\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_process_pool_matches_in_process_analysis(tmp_path, monkeypatch):
+    paths = _write_sources(tmp_path, 3) + [str(tmp_path / "missing.py")]
+    expected = ast_tools._analyze_files(paths)
+    
+    monkeypatch.setattr(ast_tools, "_PROCESS_POOL_MIN_CHARS", 0)
+    assert ast_tools._analyze_files(paths) == expected
+    # The pool is created once and reused across calls
+    pool = ast_tools._get_process_pool()
+    assert ast_tools._analyze_files(paths) == expected
+    assert ast_tools._get_process_pool() is pool
+
+
+def test_parse_lists_definitions_inside_module_level_blocks():
+    code = (
+        "import sys\n"
+        "from typing import TYPE_CHECKING\n"
+        "try:\n"
+        "    import orjson as json\n"
+        "except ImportError:\n"
+        "    import json\n"
+        "if TYPE_CHECKING:\n"
+        "    from collections.abc import Iterator\n"
+        "if sys.version_info >= (3, 11):\n"
+        "    def helper(x):\n"
+        "        import os\n"
+        "        return x\n"
+        "else:\n"
+        "    class Helper:\n"
+        "        def run(self):\n"
+        "            pass\n"
+    )
+    report = ast_tools._parse_python_code(code)
+    for name in ("orjson", "json", "collections.abc.Iterator", "helper(x)", "Helper @ line 14"):
+        assert name in report
+    assert "Imports (5)" in report
+    # Imports inside functions and methods of classes aren't module-level
+    assert "  - os" not in report
+    assert "Functions (1)" in report
+
+
+class _BrokenPool:
+    def map(self, fn, *iterables):
+        raise ast_tools.BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_pool_falls_back_to_in_process_analysis(tmp_path, monkeypatch):
+    paths = _write_sources(tmp_path, 2)
+    expected = ast_tools._analyze_files(paths)
+    broken = _BrokenPool()
+    monkeypatch.setattr(ast_tools, "_PROCESS_POOL_MIN_CHARS", 0)
+    monkeypatch.setattr(ast_tools, "_process_pool", broken)
+    
+    assert ast_tools._analyze_files(paths) == expected
+    # The broken pool is dropped so the next call starts a fresh one
+    assert broken.shut_down
+    assert ast_tools._process_pool is None
+
+
+def test_main_module_does_not_import_the_server():
+    # Spawned workers re-import __main__; for `python main.py` that must stay cheap
+    script = "import sys, main; assert 'server' not in sys.modules; assert callable(main.main)"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,49 @@
+import asyncio
+import itertools
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph
+from langgraph.prebuilt import create_react_agent
+
+from src.code_review_agent.agents.nodes.utils import astream_agent
+
+
+class _State(TypedDict):
+    result: str
+
+
+def _fake_agent(text, streaming=True):
+    model = GenericFakeChatModel(
+        messages=itertools.repeat(AIMessage(content=text)),
+        disable_streaming=not streaming,
+    )
+    return create_react_agent(model=model, tools=[])
+
+
+def _run_in_graph_node(agent):
+    """Run astream_agent from inside a graph node, as the review nodes do."""
+    async def node(state, config):
+        result = await astream_agent(agent, [HumanMessage(content="review")], config)
+        return {"result": result["messages"][-1].content}
+
+    workflow = StateGraph(_State)
+    workflow.add_node("node", node)
+    workflow.set_entry_point("node")
+    workflow.add_edge("node", "__end__")
+    return asyncio.run(workflow.compile().ainvoke({"result": ""}))["result"]
+
+
+def test_streamed_tokens_are_joined():
+    assert _run_in_graph_node(_fake_agent("looks good")) == "looks good"
+
+
+def test_non_streaming_model_inside_graph_node_returns_final_output():
+    assert _run_in_graph_node(_fake_agent("looks good", streaming=False)) == "looks good"
+
+
+def test_non_streaming_model_at_top_level_returns_final_output():
+    agent = _fake_agent("looks good", streaming=False)
+    result = asyncio.run(astream_agent(agent, [HumanMessage(content="review")], None))
+    assert result["messages"][-1].content == "looks good"
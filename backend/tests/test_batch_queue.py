@@ -0,0 +1,111 @@
+import asyncio
+import re
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.code_review_agent.agents.batch_queue import BatchQueue
+
+
+class FakeAgent:
+    """Answers numbered batch prompts; skip lists request numbers to leave out."""
+
+    def __init__(self, skip=(), fail=False, delay=0.0):
+        self.skip = set(skip)
+        self.fail = fail
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, input, config=None):
+        prompt = input["messages"][-1].content
+        self.calls.append((prompt, config))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("LLM down")
+            sections = re.findall(r"^## REQUEST (\d+)\n(.*)$", prompt, re.MULTILINE)
+            if not sections:
+                return {"messages": [AIMessage(content=f"answer to {prompt}")]}
+            reply = "\n\n".join(
+                f"## REQUEST {n}\nanswer to {content}" for n, content in sections if int(n) not in self.skip
+            )
+            return {"messages": [AIMessage(content=reply)]}
+        finally:
+            self.in_flight -= 1
+
+
+def _ask(queue, text, config=None):
+    return queue.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+
+
+def _answers(results):
+    return [result["messages"][-1].content for result in results]
+
+
+def test_concurrent_requests_share_one_call():
+    agent = FakeAgent()
+    queue = BatchQueue(agent, max_batch=8, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(_ask(queue, f"code {i}") for i in range(3)))
+
+    assert _answers(asyncio.run(main())) == ["answer to code 0", "answer to code 1", "answer to code 2"]
+    assert len(agent.calls) == 1
+
+
+def test_single_request_is_sent_as_is_with_its_config():
+    agent = FakeAgent()
+    queue = BatchQueue(agent, max_wait_ms=1)
+    config = {"tags": ["analyzer"]}
+    assert _answers([asyncio.run(_ask(queue, "code", config))]) == ["answer to code"]
+    assert agent.calls == [("code", config)]
+
+
+def test_missing_heading_reruns_that_request_alone():
+    agent = FakeAgent(skip={2})
+    queue = BatchQueue(agent, max_batch=8, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(_ask(queue, f"code {i}", {"run": i}) for i in range(3)))
+
+    answers = _answers(asyncio.run(main()))
+    assert answers == ["answer to code 0", "answer to code 1", "answer to code 2"]
+    # Nobody gets the combined reply, which holds the other requests
+    assert not any("REQUEST" in answer for answer in answers)
+    assert agent.calls[1] == ("code 1", {"run": 1})
+
+
+def test_failed_call_fails_every_caller():
+    queue = BatchQueue(FakeAgent(fail=True), max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(_ask(queue, "a"), _ask(queue, "b"), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_next_batch_is_collected_while_a_call_is_running():
+    agent = FakeAgent(delay=0.2)
+    queue = BatchQueue(agent, max_batch=1, max_wait_ms=1)
+
+    async def main():
+        return await asyncio.gather(*(_ask(queue, f"code {i}") for i in range(3)))
+
+    assert len(_answers(asyncio.run(main()))) == 3
+    assert agent.max_in_flight == 3
+
+
+@pytest.mark.parametrize("max_batch", [2, 8])
+def test_every_request_is_answered(max_batch):
+    agent = FakeAgent()
+    queue = BatchQueue(agent, max_batch=max_batch, max_wait_ms=5)
+
+    async def main():
+        return await asyncio.gather(*(_ask(queue, f"code {i}") for i in range(5)))
+
+    assert _answers(asyncio.run(main())) == [f"answer to code {i}" for i in range(5)]
@@ -0,0 +1,24 @@
+from src.code_review_agent.agents.nodes.entry_node import TRUNCATION_MARKER, truncate_code
+
+
+def test_short_code_is_unchanged():
+    assert truncate_code("x = 1\n", max_chars=100) == "x = 1\n"
+
+
+def test_code_at_limit_is_unchanged():
+    code = "a" * 10
+    assert truncate_code(code, max_chars=10) is code
+
+
+def test_long_code_keeps_head_and_tail():
+    code = "a" * 10 + "b" * 10
+    assert truncate_code(code, max_chars=10) == "a" * 5 + TRUNCATION_MARKER + "b" * 5
+
+
+def test_zero_budget_drops_all_code():
+    assert truncate_code("abcdef", max_chars=0) == TRUNCATION_MARKER
+
+
+def test_one_char_budget_drops_all_code():
+    # max_chars // 2 == 0, so neither the head nor the tail is kept
+    assert truncate_code("abcdef", max_chars=1) == TRUNCATION_MARKER
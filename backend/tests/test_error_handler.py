@@ -0,0 +1,42 @@
+import logging
+
+import pytest
+
+from src.code_review_agent.error_handler import ErrorCategory, Severity, error_handler
+
+
+@pytest.fixture
+def console_level():
+    handler = error_handler._console_handler
+    original = handler.level
+    yield handler.setLevel
+    handler.setLevel(original)
+
+
+def _build(calls):
+    def build():
+        calls.append(True)
+        return dict(category=ErrorCategory.STATE_ERROR, message="m", node="test_node", request_id="r")
+    return build
+
+
+def test_log_if_skips_records_below_the_handler_level(console_level):
+    console_level(logging.ERROR)
+    calls = []
+    error_handler.log_if(Severity.WARNING, _build(calls))
+    assert calls == []
+
+
+def test_log_if_builds_records_the_handler_writes(console_level):
+    console_level(logging.WARNING)
+    calls = []
+    error_handler.log_if(Severity.WARNING, _build(calls))
+    assert calls == [True]
+
+
+def test_log_error_counts_filtered_records(console_level):
+    console_level(logging.CRITICAL)
+    before = error_handler.get_metrics()["error_counts"].get("llm_error_warning", 0)
+    error_handler.log_error(category=ErrorCategory.LLM_ERROR, severity=Severity.WARNING, message="m", node="test_node")
+    # get_metrics may serve a cached snapshot; read the live counter
+    assert error_handler._metrics["error_counts"]["llm_error_warning"] == before + 1
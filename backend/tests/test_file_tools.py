@@ -0,0 +1,28 @@
+import os
+import threading
+
+import pytest
+
+from src.code_review_agent.tools.file_tools import _read_text
+
+
+def test_reads_regular_file(tmp_path):
+    path = tmp_path / "code.py"
+    path.write_bytes(b"x = 1\n\xff\n")
+    assert _read_text(str(path)) == "x = 1\n�\n"
+
+
+def test_directory_is_not_a_file(tmp_path):
+    assert _read_text(str(tmp_path)) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_fifo_without_writer_does_not_block(tmp_path):
+    path = tmp_path / "pipe"
+    os.mkfifo(path)
+    results = []
+    reader = threading.Thread(target=lambda: results.append(_read_text(str(path))), daemon=True)
+    reader.start()
+    reader.join(timeout=5)
+    assert not reader.is_alive(), "_read_text blocked opening a FIFO"
+    assert results == [None]
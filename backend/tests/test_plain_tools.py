@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The decorator is chosen when the tool modules are imported, so each check
+# runs in a fresh interpreter with CRA_NO_LANGCHAIN=1
+SCRIPT = textwrap.dedent("""
+    import sys
+    import types
+    from src.code_review_agent.tools import validation_tools
+    assert "langchain_core.tools" not in sys.modules
+
+    tool = validation_tools.find_common_issues
+    assert isinstance(tool, types.FunctionType)
+    assert tool.name == "find_common_issues"
+    code = "try:\\n    pass\\nexcept:\\n    pass\\n"
+    assert tool.invoke({"code": code}) == tool(code)
+    assert "Bare 'except:'" in tool(code)
+
+    from src.code_review_agent.agents.supervisor import build_single_shot_messages
+    from src.code_review_agent.agents.validator_agent import VALIDATOR_TOOLS
+    messages = build_single_shot_messages("prompt", VALIDATOR_TOOLS, "review", code)
+    assert "### find_common_issues" in messages[-1].content
+    print("ok")
+""")
+
+
+def test_tools_work_as_plain_functions():
+    env = {**os.environ, "CRA_NO_LANGCHAIN": "1", "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "test")}
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
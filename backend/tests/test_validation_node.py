@@ -0,0 +1,66 @@
+import asyncio
+import importlib
+import itertools
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import create_react_agent
+
+# The nodes package re-exports the node functions under the module names
+vn = importlib.import_module("src.code_review_agent.agents.nodes.validation_node")
+
+CODE = "def double(x):\n    return x * 2\n"
+
+
+class FakeBatchProcessor:
+    def __init__(self, result=None, error=None, hang=False):
+        self.result = result
+        self.error = error
+        self.hang = hang
+        self.submitted = []
+
+    async def submit(self, messages):
+        self.submitted.append(messages)
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    """Route batch_mode through a fake processor and the agent path through a fake agent."""
+    agent = create_react_agent(
+        model=GenericFakeChatModel(messages=itertools.repeat(AIMessage(content="agent review"))),
+        tools=[],
+    )
+    monkeypatch.setattr(vn, "_get_validator_agent", lambda: agent)
+    monkeypatch.setattr(vn, "BATCH_VALIDATION_TIMEOUT_S", 0.05)
+
+    def use(processor):
+        monkeypatch.setattr(vn, "get_batch_validation_processor", lambda: processor)
+        return processor
+    return use
+
+
+def _run():
+    state = {"user_code": CODE, "batch_mode": True, "bypass_cache": True, "request_id": "test"}
+    return asyncio.run(vn.validation_node(state, {}))
+
+
+def test_batch_result_is_used(batch):
+    processor = batch(FakeBatchProcessor(result="batch review"))
+    assert _run() == {"validation_results": "batch review", "validation_ok": True}
+    assert len(processor.submitted) == 1
+
+
+def test_failed_batch_falls_back_to_the_agent(batch):
+    batch(FakeBatchProcessor(error=RuntimeError("Validation batch b1 ended with status expired")))
+    assert _run() == {"validation_results": "agent review", "validation_ok": True}
+
+
+def test_slow_batch_falls_back_to_the_agent(batch):
+    batch(FakeBatchProcessor(hang=True))
+    assert _run() == {"validation_results": "agent review", "validation_ok": True}
@@ -0,0 +1,46 @@
+import pytest
+
+from src.code_review_agent.tools.validation_tools import find_common_issues
+
+
+def _splitlines_findings(code):
+    """TODO and long-line findings as computed from code.splitlines()."""
+    findings = []
+    for i, line in enumerate(code.splitlines(), 1):
+        if "TODO" in line or "FIXME" in line:
+            findings.append(f"Line {i}: Contains TODO/FIXME - {line.strip()[:50]}")
+    for i, line in enumerate(code.splitlines(), 1):
+        if len(line) > 100:
+            findings.append(f"Line {i}: Line too long ({len(line)} chars)")
+    return findings
+
+
+def _line_findings(report):
+    return [
+        line.strip().removeprefix("• ")
+        for line in report.splitlines()
+        if "Contains TODO/FIXME" in line or "Line too long" in line
+    ]
+
+
+LONG = "x = '" + "a" * 120 + "'"
+
+
+@pytest.mark.parametrize("sep", ["\n", "\r\n", "\r", "\f", "\x0b", "\x1c", "\x1d", "\x1e", "\x85", " ", " "])
+def test_line_numbers_match_splitlines(sep):
+    # Separators other than newlines go inside comments so the code still parses
+    code = "\n".join([
+        "# intro" + sep + "# TODO: first",
+        "y = 1  # FIXME later" + sep + "# note",
+        LONG,
+        "# end" + sep + LONG.replace("x =", "#"),
+        "",
+    ])
+    expected = _splitlines_findings(code)
+    assert expected
+    assert _line_findings(find_common_issues.invoke({"code": code})) == expected
+
+
+def test_mixed_line_endings():
+    code = "a = 1\r\n# TODO one\rb = 2\n# FIXME two\r\n" + LONG + "\r"
+    assert _line_findings(find_common_issues.invoke({"code": code})) == _splitlines_findings(code)